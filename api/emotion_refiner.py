@@ -39,14 +39,15 @@ class EmotionRefiner:
     Transforms raw AI responses into naturally expressive, therapeutically appropriate speech
     """
     
-    def __init__(self, openai_api_key: str):
+    def __init__(self, openai_api_key: str, client: Optional[openai.OpenAI] = None):
         """
         Initialize the EmotionRefiner with OpenAI API
         
         Args:
             openai_api_key: OpenAI API key for GPT-4.1-nano access
+            client: Existing OpenAI client to share (and its connection pool); created if None
         """
-        self.client = openai.OpenAI(api_key=openai_api_key)
+        self.client = client or openai.OpenAI(api_key=openai_api_key)
         self.model = "gpt-4.1-nano"  # Most cost-effective for emotion refinement 
         
         # Emotion refinement prompts
@@ -1,8 +1,10 @@
 import os
+import json
 import base64
 import tempfile
 import re
 import time
+import wave
 import logging
 from typing import Optional, List
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect
@@ -10,7 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import requests
 from dotenv import load_dotenv
-from omani_therapist_ai import OmaniTherapistAI, TimingMetrics
+from omani_therapist_ai import OmaniTherapistAI, TimingMetrics, load_config
 from voice_activity_detector import VoiceActivityDetector, VADConfig, SpeechSegment
 from pydub import AudioSegment
 import asyncio
@@ -34,6 +36,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _is_stt_ready_wav(path: str) -> bool:
+    """Check whether a file is already 16kHz mono 16-bit PCM WAV, so FFmpeg can be skipped"""
+    try:
+        with wave.open(path, 'rb') as wav_file:
+            return (wav_file.getframerate() == 16000 and wav_file.getnchannels() == 1
+                    and wav_file.getsampwidth() == 2 and wav_file.getcomptype() == 'NONE')
+    except (wave.Error, EOFError):
+        return False
+
 # Initialize AI system
 try:
     therapist_ai = OmaniTherapistAI()
@@ -152,20 +163,26 @@ async def process_audio(file: UploadFile = File(...)):
             tmp.write(content)
             tmp_path = tmp.name
         
-        # Convert audio to a standard WAV format for robust processing by Azure.
-        # This requires FFmpeg to be installed on the system.
-        logger.info(f"Converting received audio file ({ext}) to WAV format...")
-        audio_segment = AudioSegment.from_file(tmp_path)
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as wav_tmp:
-            wav_path = wav_tmp.name
-        
-        # Export to 16kHz mono WAV, optimal for speech recognition
-        audio_segment.export(wav_path, format="wav", parameters=["-ar", "16000", "-ac", "1"])
-        logger.info(f"Successfully converted audio to WAV at: {wav_path}")
+        if ext == '.wav' and _is_stt_ready_wav(tmp_path):
+            # Already in the format Azure expects; no FFmpeg round trip needed
+            logger.info("Received audio is 16kHz mono PCM WAV, skipping conversion")
+            stt_path = tmp_path
+        else:
+            # Convert audio to a standard WAV format for robust processing by Azure.
+            # This requires FFmpeg to be installed on the system.
+            logger.info(f"Converting received audio file ({ext}) to WAV format...")
+            audio_segment = AudioSegment.from_file(tmp_path)
+            
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as wav_tmp:
+                wav_path = wav_tmp.name
+            
+            # Export to 16kHz mono WAV, optimal for speech recognition
+            audio_segment.export(wav_path, format="wav", parameters=["-ar", "16000", "-ac", "1"])
+            logger.info(f"Successfully converted audio to WAV at: {wav_path}")
+            stt_path = wav_path
         
         # STT: Convert audio to text by passing the standardized WAV file path
-        user_text, timing = therapist_ai.get_user_speech_from_file(wav_path)
+        user_text, timing = therapist_ai.get_user_speech_from_file(stt_path)
         
     except Exception as e:
         logger.error(f"Failed to process audio file: {e}", exc_info=True)
@@ -230,7 +247,7 @@ async def process_audio(file: UploadFile = File(...)):
             "is_crisis_detected": is_crisis,
             "detected_emotion": detected_emotion,
             "emotion_refinement_used": therapist_ai.use_emotion_refinement,
-            "timing": timing.__dict__ if timing else None,
+            "timing": timing.as_epoch_dict() if timing else None,
             "timestamp": time.time()
         }
         
@@ -251,7 +268,7 @@ async def process_text(text: str = Form(...)):
     
     try:
         # Create dummy timing metrics
-        now = time.time()
+        now = time.perf_counter()
         timing = TimingMetrics(
             speech_start_time=now,
             speech_end_time=now,
@@ -308,7 +325,7 @@ async def process_text(text: str = Form(...)):
             "detected_emotion": detected_emotion,
             "is_crisis_detected": is_crisis,
             "emotion_refinement_used": therapist_ai.use_emotion_refinement,
-            "timing": timing.__dict__,
+            "timing": timing.as_epoch_dict(),
             "timestamp": time.time()
         }
         
@@ -388,9 +405,8 @@ async def websocket_audio_stream(websocket: WebSocket):
     await websocket.accept()
     logger.info("WebSocket connection accepted")
     
-    speech_key = os.getenv('AZURE_SPEECH_KEY')
-    speech_region = os.getenv('AZURE_SPEECH_REGION', 'uaenorth')
-    speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=speech_region)
+    config = load_config()
+    speech_config = speechsdk.SpeechConfig(subscription=config.azure_speech_key, region=config.azure_region)
     speech_config.speech_recognition_language = "ar-OM"
     
     # Configure for 16kHz mono PCM audio
@@ -433,10 +449,7 @@ async def websocket_audio_stream(websocket: WebSocket):
         
         # Process with AI
         logger.info("Calling AI for response...")
-        result = therapist_ai.get_ai_response(complete_text, TimingMetrics(
-            speech_start_time=0, speech_end_time=0, ai_processing_start_time=0, ai_processing_end_time=0,
-            tts_start_time=0, tts_end_time=0, voice_playback_start_time=0
-        ))
+        result = therapist_ai.get_ai_response(complete_text, TimingMetrics.for_speech())
         
         if result is None:
             logger.error("AI failed to generate response")
@@ -562,7 +575,6 @@ async def websocket_audio_stream(websocket: WebSocket):
                         stream.write(data)
                     elif "text" in message:
                         # Text commands (e.g., force turn completion)
-                        import json
                         try:
                             cmd = json.loads(message["text"])
                             if cmd.get("type") == "force_complete_turn":
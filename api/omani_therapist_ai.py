@@ -16,18 +16,23 @@ Created: 2025
 """
 
 import os
+import argparse
+import atexit
+import functools
 import json
 import time
 import logging
+import logging.handlers
+import queue
 import re
+import string
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Tuple, cast
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Deque, Optional, Any, Tuple, Iterator, cast
+from dataclasses import dataclass, field, fields, replace
 import io
-import tempfile
-import wave
-import struct
-from pydub import AudioSegment
 
 # Azure Speech Services
 import azure.cognitiveservices.speech as speechsdk
@@ -45,6 +50,11 @@ try:
 except ImportError:
     anthropic = None
 
+try:
+    import httpx  # installed with openai/anthropic; used to configure connection reuse
+except ImportError:
+    httpx = None
+
 # Audio playback
 import pygame
 
@@ -56,13 +66,12 @@ except ImportError:
     EmotionContext = None
     RefinedResponse = None
 
+# Persistent exact-match response cache
+from response_cache import AudioCache, ResponseCache
+
 # Environment variables
 from dotenv import load_dotenv
 
-# Load environment variables from project root
-load_dotenv(dotenv_path='../../.env')  # Look for .env in project root
-load_dotenv()  # Also check current directory as fallback
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -71,6 +80,327 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _start_background_logging() -> logging.handlers.QueueListener:
+    """
+    Move console log output onto a listener thread
+    
+    The root handlers are replaced by a QueueHandler, so logging calls on the
+    playback and synthesis threads only enqueue the record; formatting and the
+    (possibly slow) console write happen on the listener thread.
+    
+    Returns:
+        The started listener (stopped and flushed automatically at exit)
+    """
+    root = logging.getLogger()
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+# Sentence boundary for streamed responses: terminal punctuation (Latin or
+# Arabic) followed by whitespace, or a line break
+_SENTENCE_BOUNDARY_RE = re.compile(r'[.!?؟]+(?=\s)|\n+')
+
+# Long run-on sentences are split at the last clause boundary (Latin or Arabic
+# comma/semicolon) once this many characters are buffered, so TTS can start early
+_MAX_CHUNK_CHARS = 120
+_CLAUSE_BOUNDARY_RE = re.compile(r'[,،;؛]+(?=\s)')
+
+
+def iter_sentences(deltas: Iterator[str]) -> Iterator[str]:
+    """
+    Regroup streamed text deltas into complete sentences
+
+    Args:
+        deltas: Iterator of text fragments in generation order
+
+    Returns:
+        Iterator of sentences (the unterminated tail is yielded last)
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+
+        boundary = None
+        for boundary in _SENTENCE_BOUNDARY_RE.finditer(buffer):
+            pass
+
+        if not boundary and len(buffer) >= _MAX_CHUNK_CHARS:
+            for boundary in _CLAUSE_BOUNDARY_RE.finditer(buffer):
+                pass
+
+        if boundary:
+            sentence = buffer[:boundary.end()].strip()
+            buffer = buffer[boundary.end():]
+            if sentence:
+                yield sentence
+
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+# With speculative fallback (AI_HEDGE_DELAY_MS=0), an OpenAI answer arriving
+# within this many seconds is still preferred over a faster Claude answer
+_PRIMARY_GRACE_PERIOD = 0.8
+
+# Read timeout for a hedged OpenAI call: long enough for a full reply, but a call
+# still running by then has lost to Claude and should free its worker instead of
+# holding it for the client's 30 s default
+_HEDGED_PRIMARY_TIMEOUT = 10.0
+
+# Per-turn timing records kept for inspection; statistics cover every turn regardless
+TIMING_HISTORY_SIZE = 256
+
+# Fixed messages spoken by the voice loop
+WELCOME_MESSAGE = "أهلاً وسهلاً بك في جلسة العلاج النفسي. أنا هنا لمساعدتك والاستماع إليك. كيف حالك اليوم؟"
+FAREWELL_MESSAGE = "شكراً لك على الجلسة. أتمنى أن تكون مفيدة. إلى اللقاء، وأتمنى لك كل الخير."
+RESET_MESSAGE = "حسناً، لنبدأ من جديد. كيف يمكنني مساعدتك اليوم؟"
+FALLBACK_MESSAGE = "أعتذر، لم أتمكن من فهم طلبك. هل يمكنك إعادة السؤال؟"
+_CANNED_MESSAGES = frozenset({WELCOME_MESSAGE, FAREWELL_MESSAGE, RESET_MESSAGE, FALLBACK_MESSAGE})
+# Fixed messages are spoken sentence by sentence, so their SSML is cached per sentence too
+_CANNED_TEXTS = _CANNED_MESSAGES | frozenset(
+    sentence for message in _CANNED_MESSAGES
+    for sentence in iter_sentences(iter([message]))
+)
+
+# Emotion-specific prosody settings - optimized for natural human-like speech
+# Based on Azure TTS best practices to avoid chipmunk/robotic effects
+EMOTION_PROSODY = {
+    'calm': {'rate': '-5%', 'pitch': '-5%', 'volume': 'soft'},
+    'encouraging': {'rate': '+10%', 'pitch': '+8%', 'volume': 'medium'},
+    'excited': {'rate': '+15%', 'pitch': '+12%', 'volume': 'medium'},  # Reduced from +35%/+25% to avoid chipmunk effect
+    'sad': {'rate': '-10%', 'pitch': '-8%', 'volume': 'soft'},  # Reduced from -20%/-15% to be less robotic
+    'neutral': {'rate': 'medium', 'pitch': 'medium', 'volume': 'medium'}
+}
+
+_SSML_TEMPLATE = string.Template("""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="$xml_lang">
+            <voice name="$voice_name">
+                <prosody rate="$rate" pitch="$pitch" volume="$volume">
+                    $text
+                </prosody>
+            </voice>
+        </speak>""")
+
+# Text escaping that leaves the generated <break/> tags and existing entities intact
+_SSML_BARE_AMPERSAND_RE = re.compile(r'&(?!(?:amp|lt|gt|quot|apos|#\d+|#x[0-9a-fA-F]+);)')
+_SSML_STRAY_LT_RE = re.compile(r'<(?!/?break\b)')
+
+# Embedded documents and tags that would conflict with our SSML wrapper
+_SSML_STRAY_TAG_RE = re.compile(r'<\?xml[^>]*\?>|</?(?:speak|voice|prosody|emphasis|phoneme|say-as|sub)[^>]*>')
+# Break tags in any of the shapes the model produces (typo'd, single-quoted, not self-closed)
+_SSML_BREAK_RE = re.compile(r'<(?:b?break\s+time="([^"]+)"|break\s+time=\'([^\']+)\')\s*/?>')
+
+# Emotion markers from GPT-4.1-nano refinement (the text between asterisks, lowercase),
+# converted to breaks instead of being spoken
+EMOTION_MARKERS = {
+    # Sigh variations
+    'soft sigh': '<break time="500ms"/>',
+    'gentle sigh': '<break time="450ms"/>',
+    'deep sigh': '<break time="600ms"/>',
+    'relieved sigh': '<break time="400ms"/>',
+    'tired sigh': '<break time="550ms"/>',
+    'sad sigh': '<break time="650ms"/>',
+    'thoughtful sigh': '<break time="500ms"/>',
+    'proud sigh': '<break time="400ms"/>',
+    
+    # Pause variations
+    'soft pause': '<break time="400ms"/>',
+    'gentle pause': '<break time="350ms"/>',
+    'thoughtful pause': '<break time="500ms"/>',
+    'encouraging pause': '<break time="300ms"/>',
+    'reassuring pause': '<break time="350ms"/>',
+    'contemplative pause': '<break time="550ms"/>',
+    'excited pause': '<break time="200ms"/>',
+    'calming pause': '<break time="450ms"/>',
+    
+    # Arabic emotion markers
+    'تنهد خفيف': '<break time="500ms"/>',  # soft sigh
+    'تنهد عميق': '<break time="600ms"/>',  # deep sigh
+    'تنهد حزين': '<break time="650ms"/>',  # sad sigh
+    'تنهد مطمئن': '<break time="400ms"/>',  # reassuring sigh
+    'وقفة خفيفة': '<break time="350ms"/>',  # soft pause
+    'وقفة مطمئنة': '<break time="350ms"/>',  # reassuring pause
+    'وقفة متأملة': '<break time="500ms"/>',  # contemplative pause
+    'وقفة مشجعة': '<break time="300ms"/>',  # encouraging pause
+    'وقفة فرحة': '<break time="250ms"/>',  # happy pause
+    'وقفة هادئة': '<break time="450ms"/>',  # calm pause
+    
+    # Breathing and grounding markers
+    'deep breath': '<break time="700ms"/>',
+    'breathe': '<break time="600ms"/>',
+    'inhale': '<break time="500ms"/>',
+    'exhale': '<break time="500ms"/>',
+    'تنفس عميق': '<break time="700ms"/>',  # deep breath
+    'شهيق': '<break time="500ms"/>',  # inhale
+    'زفير': '<break time="500ms"/>',  # exhale
+    
+    # Voice quality markers that should be removed
+    'whispered': '',
+    'softly': '',
+    'gently': '',
+    'warmly': '',
+    'quietly': '',
+    'بهمس': '',  # whispered
+    'بلطف': '',  # gently
+    'بحنان': '',  # warmly
+}
+# One pass over the text for every marker (longest first, so no marker shadows a longer one)
+_EMOTION_MARKER_RE = re.compile(
+    r'\*(' + '|'.join(map(re.escape, sorted(EMOTION_MARKERS, key=len, reverse=True))) + r')\*',
+    re.IGNORECASE
+)
+# IGNORECASE also matches variants that lower() does not map back to a key (e.g. 'ſ' for 's')
+_EMOTION_MARKER_BREAKS = {marker.casefold(): replacement for marker, replacement in EMOTION_MARKERS.items()}
+
+# Ellipses, simple sighs and hesitation markers (English and Arabic)
+_EXPRESSION_PAUSE_SUBS = [(re.compile(pattern, flags), replacement) for pattern, replacement, flags in (
+    (r'\.{3,}', '<break time="800ms"/>', 0),  # ...
+    (r'_{3,}', '<break time="600ms"/>', 0),   # ___
+    (r'<sigh>', '<break time="400ms"/>', 0),
+    (r'\*sigh\*', '<break time="400ms"/>', 0),
+    (r'\(sigh\)', '<break time="400ms"/>', 0),
+    (r'\buh+m+\b', '<break time="300ms"/>um<break time="200ms"/>', re.IGNORECASE),
+    (r'\bah+\b', '<break time="250ms"/>ah<break time="150ms"/>', re.IGNORECASE),
+    (r'\bwell\b', 'well<break time="200ms"/>', re.IGNORECASE),
+    (r'\byou know\b', 'you know<break time="150ms"/>', re.IGNORECASE),
+    (r'\bيعني\b', 'يعني<break time="200ms"/>', 0),  # "I mean"
+    (r'\bأه\b', 'أه<break time="150ms"/>', 0),     # "ah"
+    (r'\bإم\b', 'إم<break time="200ms"/>', 0),     # "um"
+)]
+
+# Pause after sentence ends and commas: quick when excited, longer when calm or sad
+_SENTENCE_END_PAUSE_RE = re.compile(r'([.!?])\s+')
+_COMMA_PAUSE_RE = re.compile(r'(,)\s+')
+_PUNCTUATION_PAUSES = {
+    'excited': ('150ms', '100ms'),
+    'calm': ('400ms', '250ms'),
+    'sad': ('400ms', '250ms'),
+    'neutral': ('300ms', '150ms'),
+}
+
+# Markers left after the passes above, then runs of consecutive breaks
+_LEFTOVER_MARKER_SUBS = [(re.compile(pattern, flags), replacement) for pattern, replacement, flags in (
+    (r'\*[^*]*\*', '', 0),  # Any remaining *text* patterns
+    (r'\([^)]*pause[^)]*\)', '<break time="300ms"/>', re.IGNORECASE),
+    (r'\([^)]*sigh[^)]*\)', '<break time="400ms"/>', re.IGNORECASE),
+    (r'(<break time="[^"]*"/>\s*){2,}', '<break time="600ms"/>', 0),
+)]
+
+# Crisis indicators in recent user messages, most severe level first
+CRISIS_KEYWORDS = {
+    'severe': ['أريد أن أموت', 'أقتل نفسي', 'suicide', 'kill myself', 'end it all'],
+    'moderate': ['لا أستطيع', 'يائس', 'مكتئب جداً', 'can\'t take it', 'hopeless', 'severely depressed'],
+    'mild': ['حزين', 'قلق', 'صعب', 'sad', 'anxious', 'difficult', 'struggling']
+}
+_CRISIS_LEVEL_RES = [
+    (level, re.compile('|'.join(map(re.escape, keywords))))
+    for level, keywords in CRISIS_KEYWORDS.items()
+]
+
+# Voice commands, matched anywhere in the utterance (case-insensitive)
+EXIT_KEYWORDS = ('انتهى', 'exit', 'bye', 'وداعا')
+RESET_KEYWORDS = ('بداية جديدة', 'reset', 'start over')
+_EXIT_COMMAND_RE = re.compile('|'.join(map(re.escape, EXIT_KEYWORDS)), re.IGNORECASE)
+_RESET_COMMAND_RE = re.compile('|'.join(map(re.escape, RESET_KEYWORDS)), re.IGNORECASE)
+
+# Language detection: Arabic script blocks (incl. presentation forms) vs Latin letters.
+# Characters are counted by deleting everything *outside* the class in one C-level
+# pass, which avoids building a list of one-character matches
+_NON_ARABIC_CHARS_RE = re.compile(r'[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]+')
+_NON_LATIN_CHARS_RE = re.compile(r'[^a-zA-Z]+')
+ENGLISH_INDICATORS = ('hello', 'hi', 'hey', 'how are you', 'thank you', 'yes', 'no', 'can you', 'i am', 'help me')
+
+# Arabic and English patterns for choosing the TTS emotion of a response
+EMOTION_PATTERNS = {
+    'encouraging': [
+        # Arabic encouraging patterns
+        r'\b(تستطيع|قادر|قوي|ممتاز|رائع|أحسنت|موفق|إن شاء الله بيكون خير|تقدر)\b',
+        r'\b(لا تخاف|لا تقلق|أنت بخير|راح يكون أحسن|استمر|امشي قدام)\b',
+        r'\b(أنت قوي|عندك قوة|فيك أمل|الله معاك|ثق بنفسك)\b',
+        # English encouraging patterns  
+        r'\b(you can|you\'re capable|strong|excellent|great|keep going|trust yourself)\b',
+        r'\b(don\'t worry|don\'t fear|you\'re doing well|it will get better|believe in yourself)\b',
+        r'\b(proud of you|you\'ve got this|stay positive|you\'re on the right track)\b'
+    ],
+    'excited': [
+        # Arabic excited patterns
+        r'\b(مبروك|تهانينا|ممتاز جداً|رائع جداً|أحسنت|هذا رائع|عظيم|فرحان لك)\b',
+        r'\b(ما شاء الله|الله يبارك فيك|هذا إنجاز عظيم|تطور رائع)\b',
+        # English excited patterns
+        r'\b(congratulations|amazing|fantastic|wonderful|excellent|great job|awesome)\b',
+        r'\b(so proud|incredible progress|breakthrough|outstanding|brilliant)\b',
+        r'[!]{2,}|[؟]{2,}'  # Multiple exclamation marks
+    ],
+    'sad': [
+        # Arabic sad/empathetic patterns  
+        r'\b(أتفهم ألمك|أعرف أنه صعب|هذا مؤلم|أحس بيك|أحزن لك)\b',
+        r'\b(صعب عليك|تعبان|حزين|ألم|معاناة|صبر|ابتلاء)\b',
+        r'\b(أسف لما تمر به|الله يصبرك|الله يعينك|أدعو لك)\b',
+        # English sad/empathetic patterns
+        r'\b(I understand your pain|I know it\'s hard|I\'m sorry you\'re going through|I feel for you)\b',
+        r'\b(difficult|painful|struggling|heartbroken|grieving|loss|suffering)\b',
+        r'\b(my heart goes out|sending you strength|you\'re not alone in this)\b'
+    ],
+    'calm': [
+        # Arabic calm patterns
+        r'\b(هدوء|استرخي|تنفس|سكينة|طمأنينة|اهدأ|خذ وقتك)\b',
+        r'\b(بالهدوء|بروية|ببطء|خطوة بخطوة|واحدة واحدة)\b',
+        r'\b(التأمل|الصلاة|الذكر|الاستغفار|السكينة|الطمأنينة)\b',
+        # English calm patterns  
+        r'\b(calm|relax|breathe|peaceful|serenity|take your time|slowly)\b',
+        r'\b(meditation|mindfulness|deep breath|settle|center yourself)\b',
+        r'\b(step by step|one moment at a time|gently|softly)\b'
+    ]
+}
+
+# One compiled alternation per emotion, checked in the order above
+_EMOTION_RES = {
+    emotion: re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+    for emotion, patterns in EMOTION_PATTERNS.items()
+}
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    """Credentials and optional settings read once from the environment"""
+    azure_speech_key: Optional[str]
+    azure_region: str
+    openai_api_key: Optional[str]
+    anthropic_api_key: Optional[str]
+    response_cache_path: Optional[str]
+    transcript_log_path: Optional[str]
+    ai_hedge_delay: Optional[float]
+    tts_cache_dir: Optional[str]
+
+
+@functools.lru_cache(maxsize=None)
+def load_config() -> ServiceConfig:
+    """
+    Load .env files and snapshot the configuration (done once per process)
+    
+    Returns:
+        ServiceConfig built from environment variables
+    """
+    load_dotenv(dotenv_path='../../.env')  # Look for .env in project root
+    load_dotenv()  # Also check current directory as fallback
+    
+    env = os.environ
+    return ServiceConfig(
+        # Try backup Azure key if primary not found
+        azure_speech_key=env.get('AZURE_SPEECH_KEY') or env.get('AZURE_SPEECH_KEY_BACKUP'),
+        azure_region=env.get('AZURE_SPEECH_REGION', 'uaenorth'),
+        openai_api_key=env.get('OPENAI_API_KEY'),
+        anthropic_api_key=env.get('ANTHROPIC_API_KEY'),
+        response_cache_path=env.get('AI_RESPONSE_CACHE_PATH'),
+        transcript_log_path=env.get('SESSION_TRANSCRIPT_LOG_PATH'),
+        ai_hedge_delay=float(env['AI_HEDGE_DELAY_MS']) / 1000 if env.get('AI_HEDGE_DELAY_MS') else None,
+        tts_cache_dir=env.get('TTS_CACHE_DIR')
+    )
+
+
 @dataclass
 class ConversationMessage:
     """Represents a single conversation message"""
@@ -79,11 +409,33 @@ class ConversationMessage:
     timestamp: datetime
     voice_gender: Optional[str] = None
     emotion: Optional[str] = None
+    _context: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def context_dict(self) -> Dict[str, str]:
+        """
+        Truncated, serialized form used as emotion-refinement context
+
+        Built on first use and kept, rather than rebuilt on every turn. Messages
+        are replaced (dataclasses.replace), never edited, when their content
+        changes, so the cached form cannot go stale.
+        """
+        if self._context is None:
+            self._context = {
+                'role': self.role,
+                'content': self.content[:200] + '...' if len(self.content) > 200 else self.content,  # Truncate long messages
+                'timestamp': self.timestamp.isoformat()
+            }
+        return self._context
 
 
 @dataclass
 class TimingMetrics:
-    """Represents timing metrics for a conversation turn"""
+    """Represents timing metrics for a conversation turn
+    
+    Timestamps come from time.perf_counter(): monotonic and high resolution,
+    so durations are never skewed by wall-clock adjustments. Only differences
+    between them are meaningful.
+    """
     speech_start_time: float
     speech_end_time: float
     ai_processing_start_time: float
@@ -92,6 +444,33 @@ class TimingMetrics:
     tts_end_time: float
     voice_playback_start_time: float
     
+    @classmethod
+    def for_speech(cls, speech_start_time: float = 0.0,
+                   speech_end_time: Optional[float] = None) -> "TimingMetrics":
+        """
+        Create metrics for a new turn with only the STT timestamps filled in
+        
+        Args:
+            speech_start_time: When listening started
+            speech_end_time: When recognition finished, defaults to speech_start_time
+            
+        Returns:
+            TimingMetrics with the later stages zeroed
+        """
+        if speech_end_time is None:
+            speech_end_time = speech_start_time
+        return cls(speech_start_time, speech_end_time, 0, 0, 0, 0, 0)
+    
+    def as_epoch_dict(self) -> Dict[str, float]:
+        """
+        Timestamps as epoch seconds (time.time()), as returned by the API
+        
+        perf_counter() readings are shifted by the current offset between the
+        two clocks; stages that were never reached stay 0.
+        """
+        offset = time.time() - time.perf_counter()
+        return {name: value + offset if value else 0.0 for name, value in self.__dict__.items()}
+    
     @property
     def total_latency(self) -> float:
         """Total time from speech start to voice playback start"""
@@ -133,14 +512,11 @@ class OmaniTherapistAI:
     def __init__(self):
         """Initialize the Omani Therapist AI system"""
         # Load API keys from environment ##############################################################################################################################
-        self.azure_speech_key = os.getenv('AZURE_SPEECH_KEY')
-        self.azure_region = os.getenv('AZURE_SPEECH_REGION', 'uaenorth')
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
-        
-        # Try backup Azure key if primary not found
-        if not self.azure_speech_key:
-            self.azure_speech_key = os.getenv('AZURE_SPEECH_KEY_BACKUP')
+        config = load_config()
+        self.azure_speech_key = config.azure_speech_key
+        self.azure_region = config.azure_region
+        self.openai_api_key = config.openai_api_key
+        self.anthropic_api_key = config.anthropic_api_key
         
         # Validate required credentials
         if not self.azure_speech_key:
@@ -153,15 +529,28 @@ class OmaniTherapistAI:
             logger.warning("Anthropic API key not found. No fallback available if OpenAI fails.")
         
         # Initialize AI clients
+        self.openai_client = None
         if self.openai_api_key and openai:
-            openai.api_key = self.openai_api_key
-            self.openai_client = openai
+            # Dedicated client with a keep-alive pool shared by all turns and threads
+            self.openai_client = openai.OpenAI(
+                api_key=self.openai_api_key,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=120.0),
+                    timeout=httpx.Timeout(30.0, connect=3.0)
+                ) if httpx else None
+            )
         
         if self.anthropic_api_key and anthropic:
             try:
-                # Initialize Anthropic client according to official documentation
+                # Initialize Anthropic client according to official documentation,
+                # with keep-alive connections held across turns so the fallback
+                # path does not pay a fresh TLS handshake each time
                 self.claude_client = anthropic.Anthropic(
-                    api_key=self.anthropic_api_key
+                    api_key=self.anthropic_api_key,
+                    http_client=httpx.Client(
+                        limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300.0),
+                        timeout=30.0
+                    ) if httpx else None
                 )
                 logger.info("Anthropic client initialized successfully")
             except Exception as e:
@@ -172,16 +561,27 @@ class OmaniTherapistAI:
         
         # Initialize Azure Speech services
         self._setup_azure_speech()
-        
-        # Initialize pygame for audio playback
-        pygame.mixer.init(frequency=48000, size=-16, channels=1, buffer=1024)
+        self.prewarm_tts()
+        self.prewarm_ai_connections()
+
+        # pygame mixer for local playback is initialized on first use (see _ensure_mixer),
+        # so the API server, which only returns audio bytes, never opens an audio device
+        self._mixer_lock = threading.Lock()
         
         # Session memory (list of ConversationMessage objects)
         self.session_memory: List[ConversationMessage] = []
         self.max_memory_turns = 10  # Keep last 10 exchanges
         
-        # Timing metrics storage
-        self.timing_history: List[TimingMetrics] = []
+        # Rolling summary of the messages that have left the prompt window
+        self._history_summary = ""
+        self._summarized_messages = 0
+        self._summary_thread: Optional[threading.Thread] = None
+        self._session_generation = 0
+        
+        # Timing metrics storage, with running aggregates so statistics are O(1);
+        # only the most recent turns are kept individually
+        self.timing_history: Deque[TimingMetrics] = deque(maxlen=TIMING_HISTORY_SIZE)
+        self._timing_totals: Dict[str, float] = {}
         
         # Enhanced therapeutic system prompts with detailed cultural guidelines ###############################################################
         self.system_prompt_arabic = """أنت دكتور نفسي عماني متخصص ومتفهم، تعمل كمساعد للعلاج النفسي مع الحفاظ على الثقافة العمانية والإسلامية. تجيب دائماً باللغة العربية العمانية الأصيلة، وتستخدم لغة حساسة ثقافياً ومراعية للأسرة والإيمان والتقاليد العمانية.
@@ -294,6 +694,11 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         # Default system prompt (Arabic)
         self.system_prompt = self.system_prompt_arabic
         
+        # Introduces the summary of older messages, in the same language as the system prompt
+        self.summary_prefix_arabic = "ملخص ما سبق من الجلسة: "
+        self.summary_prefix_english = "Summary of the session so far: "
+        self.summary_prefix = self.summary_prefix_arabic
+        
         # Add system message to memory
         self.session_memory.append(ConversationMessage(
             role="system",
@@ -317,19 +722,53 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         self.default_voice_gender = "male"
         self.default_emotion = "neutral"
         
-        # Initialize Advanced Emotion Refinement (GPT-4.1-nano)
+        # Advanced Emotion Refinement (GPT-4.1-nano); the refiner is created on first use
         self.emotion_refiner = None
-        self.use_emotion_refinement = False
-        if EmotionRefiner and self.openai_api_key:
-            try:
-                self.emotion_refiner = EmotionRefiner(self.openai_api_key)
-                self.use_emotion_refinement = True
-                logger.info("✨ Advanced Emotion Refinement enabled (GPT-4.1-nano)")
-            except Exception as e:
-                logger.warning(f"Failed to initialize EmotionRefiner: {e}")
+        self.use_emotion_refinement = bool(EmotionRefiner and self.openai_api_key)
+        if self.use_emotion_refinement:
+            logger.info("✨ Advanced Emotion Refinement enabled (GPT-4.1-nano)")
         else:
             logger.info("Advanced Emotion Refinement disabled (missing dependencies)")
-        
+
+        # Persistent response cache (opt-in: it stores conversation text on disk)
+        self.response_cache: Optional[ResponseCache] = None
+        cache_path = config.response_cache_path
+        if cache_path:
+            try:
+                self.response_cache = ResponseCache(cache_path)
+            except Exception as e:
+                logger.warning(f"Failed to open AI response cache: {e}")
+
+        # Incremental JSONL transcript (opt-in: it stores conversation text on disk)
+        self._transcript_log = None
+        transcript_log_path = config.transcript_log_path
+        if transcript_log_path:
+            try:
+                self._transcript_log = open(transcript_log_path, 'a', encoding='utf-8', buffering=1)
+            except OSError as e:
+                logger.warning(f"Failed to open session transcript log: {e}")
+
+        # Synthesized audio cache (small clips in memory; on disk only if TTS_CACHE_DIR is set),
+        # bounded by total bytes in both tiers
+        self.audio_cache = AudioCache(config.tts_cache_dir)
+
+        # Hedged AI requests: start Claude if OpenAI has not answered within the delay.
+        # Each provider gets its own pool, so calls that lost the race (and are left
+        # to finish) can never queue the other provider's hedge behind them
+        self.ai_hedge_delay = config.ai_hedge_delay
+        self._openai_executor: Optional[ThreadPoolExecutor] = None
+        self._claude_executor: Optional[ThreadPoolExecutor] = None
+        if self.ai_hedge_delay is not None:
+            self._openai_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-hedge-openai")
+            self._claude_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-hedge-claude")
+
+        # SSML for the fixed loop messages, built once per voice/emotion/crisis level
+        self._canned_ssml_cache: Dict[Tuple[str, str, str, str, str], str] = {}
+        # SSML wrappers keyed by (xml_lang, voice, rate, pitch, volume)
+        self._ssml_templates: Dict[Tuple[str, str, str, str, str], string.Template] = {}
+        # Last crisis assessment, with the messages it was computed from
+        self._crisis_cache: Optional[Tuple[List[ConversationMessage], str]] = None
+
         logger.info("Omani Therapist AI initialized successfully")
     
     def detect_language(self, text: str) -> str:
@@ -349,10 +788,10 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         text = text.strip().lower()
         
         # Count Arabic characters (including Arabic numerals)
-        arabic_chars = len(re.findall(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]', text))
+        arabic_chars = len(_NON_ARABIC_CHARS_RE.sub('', text))
         
         # Count English characters (Latin alphabet)
-        english_chars = len(re.findall(r'[a-zA-Z]', text))
+        english_chars = len(_NON_LATIN_CHARS_RE.sub('', text))
         
         # Count total meaningful characters (excluding spaces and punctuation)
         total_chars = arabic_chars + english_chars
@@ -373,9 +812,7 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             return 'en'
         
         # Check for common English words/phrases
-        english_indicators = ['hello', 'hi', 'hey', 'how are you', 'thank you', 'yes', 'no', 'can you', 'i am', 'help me']
-        text_lower = text.lower()
-        english_word_count = sum(1 for indicator in english_indicators if indicator in text_lower)
+        english_word_count = sum(1 for indicator in ENGLISH_INDICATORS if indicator in text)
         
         if english_word_count >= 1 and english_ratio > 0.3:
             logger.info("Detected English based on common words")
@@ -400,54 +837,10 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         
         text_lower = text.lower()
         
-        # Arabic and English patterns for different emotions
-        emotion_patterns = {
-            'encouraging': [
-                # Arabic encouraging patterns
-                r'\b(تستطيع|قادر|قوي|ممتاز|رائع|أحسنت|موفق|إن شاء الله بيكون خير|تقدر)\b',
-                r'\b(لا تخاف|لا تقلق|أنت بخير|راح يكون أحسن|استمر|امشي قدام)\b',
-                r'\b(أنت قوي|عندك قوة|فيك أمل|الله معاك|ثق بنفسك)\b',
-                # English encouraging patterns  
-                r'\b(you can|you\'re capable|strong|excellent|great|keep going|trust yourself)\b',
-                r'\b(don\'t worry|don\'t fear|you\'re doing well|it will get better|believe in yourself)\b',
-                r'\b(proud of you|you\'ve got this|stay positive|you\'re on the right track)\b'
-            ],
-            'excited': [
-                # Arabic excited patterns
-                r'\b(مبروك|تهانينا|ممتاز جداً|رائع جداً|أحسنت|هذا رائع|عظيم|فرحان لك)\b',
-                r'\b(ما شاء الله|الله يبارك فيك|هذا إنجاز عظيم|تطور رائع)\b',
-                # English excited patterns
-                r'\b(congratulations|amazing|fantastic|wonderful|excellent|great job|awesome)\b',
-                r'\b(so proud|incredible progress|breakthrough|outstanding|brilliant)\b',
-                r'[!]{2,}|[؟]{2,}'  # Multiple exclamation marks
-            ],
-            'sad': [
-                # Arabic sad/empathetic patterns  
-                r'\b(أتفهم ألمك|أعرف أنه صعب|هذا مؤلم|أحس بيك|أحزن لك)\b',
-                r'\b(صعب عليك|تعبان|حزين|ألم|معاناة|صبر|ابتلاء)\b',
-                r'\b(أسف لما تمر به|الله يصبرك|الله يعينك|أدعو لك)\b',
-                # English sad/empathetic patterns
-                r'\b(I understand your pain|I know it\'s hard|I\'m sorry you\'re going through|I feel for you)\b',
-                r'\b(difficult|painful|struggling|heartbroken|grieving|loss|suffering)\b',
-                r'\b(my heart goes out|sending you strength|you\'re not alone in this)\b'
-            ],
-            'calm': [
-                # Arabic calm patterns
-                r'\b(هدوء|استرخي|تنفس|سكينة|طمأنينة|اهدأ|خذ وقتك)\b',
-                r'\b(بالهدوء|بروية|ببطء|خطوة بخطوة|واحدة واحدة)\b',
-                r'\b(التأمل|الصلاة|الذكر|الاستغفار|السكينة|الطمأنينة)\b',
-                # English calm patterns  
-                r'\b(calm|relax|breathe|peaceful|serenity|take your time|slowly)\b',
-                r'\b(meditation|mindfulness|deep breath|settle|center yourself)\b',
-                r'\b(step by step|one moment at a time|gently|softly)\b'
-            ]
-        }
-        
-        # Check each emotion pattern
-        for emotion, patterns in emotion_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    return emotion
+        # Check each emotion pattern (first matching emotion wins)
+        for emotion, pattern in _EMOTION_RES.items():
+            if pattern.search(text_lower):
+                return emotion
         
         # Default emotion based on punctuation and context
         if '!' in text or '؟' in text:
@@ -477,12 +870,127 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
                 speechsdk.SpeechSynthesisOutputFormat.Riff48Khz16BitMonoPcm
             )
             
-            logger.info(f"Azure Speech Services configured - Region: {self.azure_region}")
+            # Compressed TTS configuration for local playback: ~6x fewer bytes to
+            # download than 48kHz PCM; API clients keep receiving WAV
+            self.playback_tts_config = speechsdk.SpeechConfig(
+                subscription=self.azure_speech_key,
+                region=self.azure_region
+            )
+            self.playback_tts_config.set_speech_synthesis_output_format(
+                speechsdk.SpeechSynthesisOutputFormat.Audio48Khz192KBitRateMonoMp3
+            )
             
+            # Long-lived synthesizer reused across turns (voice is selected in the SSML)
+            self._synthesizer = self._create_synthesizer()
+            # Playback synthesizers are created per thread on first use (the API server never needs one)
+            self._playback_synthesizers = threading.local()
+            self._tts_executor: Optional[ThreadPoolExecutor] = None
+            
+            # Microphone recognizer is created on first use (the API server never needs one)
+            self._mic_recognizer = None
+
+            logger.info(f"Azure Speech Services configured - Region: {self.azure_region}")
+
         except Exception as e:
             logger.error(f"Failed to setup Azure Speech Services: {e}")
             raise
-    
+
+    def _create_synthesizer(self, compressed: bool = False):
+        """Create a SpeechSynthesizer that returns audio in memory"""
+        return speechsdk.SpeechSynthesizer(
+            speech_config=self.playback_tts_config if compressed else self.tts_config,
+            audio_config=None
+        )
+
+    def _get_mic_recognizer(self):
+        """Return the long-lived default-microphone recognizer, creating it on first use"""
+        if self._mic_recognizer is None:
+            audio_config = speechsdk.AudioConfig(use_default_microphone=True)
+            self._mic_recognizer = speechsdk.SpeechRecognizer(
+                speech_config=self.stt_config,
+                audio_config=audio_config
+            )
+            try:
+                speechsdk.Connection.from_recognizer(self._mic_recognizer).open(False)
+            except Exception as e:
+                logger.warning(f"STT pre-connect failed: {e}")
+        return self._mic_recognizer
+
+    def prewarm_tts(self):
+        """Open the synthesizer connection ahead of the first utterance"""
+        try:
+            connection = speechsdk.Connection.from_speech_synthesizer(self._synthesizer)
+            connection.open(True)
+            logger.info("🔊 TTS connection pre-warmed")
+        except Exception as e:
+            logger.warning(f"TTS pre-warm failed: {e}")
+
+    def prewarm_ai_connections(self):
+        """
+        Open keep-alive connections to the AI providers on a background thread
+        
+        A cheap authenticated request (listing models) completes DNS, TCP and
+        TLS setup, so the first real turn reuses a warm pooled connection.
+        """
+        def warm_up():
+            if self.openai_client:
+                try:
+                    self.openai_client.models.list()
+                    logger.info("🤖 OpenAI connection pre-warmed")
+                except Exception as e:
+                    logger.warning(f"OpenAI pre-warm failed: {e}")
+            if self.claude_client:
+                try:
+                    self.claude_client.models.list(limit=1)
+                    logger.info("🤖 Anthropic connection pre-warmed")
+                except Exception as e:
+                    logger.warning(f"Anthropic pre-warm failed: {e}")
+        
+        threading.Thread(target=warm_up, name="ai-prewarm", daemon=True).start()
+
+    def _get_playback_synthesizer(self):
+        """Return this thread's MP3 playback synthesizer, creating it on first use"""
+        # One playback synthesizer per thread so pooled sentences synthesize in parallel
+        synthesizer = getattr(self._playback_synthesizers, 'synthesizer', None)
+        if synthesizer is None:
+            synthesizer = self._create_synthesizer(compressed=True)
+            self._playback_synthesizers.synthesizer = synthesizer
+        return synthesizer
+
+    def _prewarm_playback_synthesizer(self):
+        """Create and connect a playback synthesizer on the calling (TTS pool) thread"""
+        try:
+            speechsdk.Connection.from_speech_synthesizer(self._get_playback_synthesizer()).open(True)
+        except Exception as e:
+            logger.warning(f"Playback TTS pre-warm failed: {e}")
+
+    def _synthesize_ssml(self, ssml_text: str, compressed: bool = False):
+        """
+        Synthesize SSML on the cached synthesizer
+
+        If the synthesis is canceled with an error (e.g. an expired or dropped
+        connection) the synthesizer is rebuilt once and the request retried.
+
+        Args:
+            ssml_text: SSML document to synthesize
+            compressed: Use the MP3 playback synthesizer instead of 48kHz PCM
+        """
+        synthesizer = self._get_playback_synthesizer() if compressed else self._synthesizer
+
+        result = synthesizer.speak_ssml_async(ssml_text).get()
+
+        if (result is not None and result.reason == speechsdk.ResultReason.Canceled
+                and result.cancellation_details.reason == speechsdk.CancellationReason.Error):
+            logger.warning(f"TTS synthesis canceled ({result.cancellation_details.error_details}), rebuilding synthesizer")
+            synthesizer = self._create_synthesizer(compressed)
+            if compressed:
+                self._playback_synthesizers.synthesizer = synthesizer
+            else:
+                self._synthesizer = synthesizer
+            result = synthesizer.speak_ssml_async(ssml_text).get()
+
+        return result
+
     def get_user_speech(self, timeout_seconds: int = 10) -> Tuple[Optional[str], Optional[TimingMetrics]]:
         """
         Capture user speech using microphone and convert to text
@@ -495,16 +1003,10 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         """
         try:
             # Record speech start time
-            speech_start_time = time.time()
-            
-            # Use default microphone
-            audio_config = speechsdk.AudioConfig(use_default_microphone=True)
+            speech_start_time = time.perf_counter()
             
-            # Create speech recognizer
-            recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.stt_config,
-                audio_config=audio_config
-            )
+            # Reuse the microphone recognizer (and its service connection) across turns
+            recognizer = self._get_mic_recognizer()
             
             logger.info("🎤 Listening for speech...")
             print("🎤 Listening... (speak in Arabic)")
@@ -513,22 +1015,14 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             result = recognizer.recognize_once_async().get()
             
             # Record speech end time
-            speech_end_time = time.time()
+            speech_end_time = time.perf_counter()
             
             if result and result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 user_text = result.text.strip()
                 logger.info(f"✅ Recognized: {user_text}")
                 
                 # Create partial timing metrics (will be completed later)
-                timing_metrics = TimingMetrics(
-                    speech_start_time=speech_start_time,
-                    speech_end_time=speech_end_time,
-                    ai_processing_start_time=0,
-                    ai_processing_end_time=0,
-                    tts_start_time=0,
-                    tts_end_time=0,
-                    voice_playback_start_time=0
-                )
+                timing_metrics = TimingMetrics.for_speech(speech_start_time, speech_end_time)
                 
                 return user_text, timing_metrics
                 
@@ -543,6 +1037,8 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
                 
                 if cancellation_details.reason == speechsdk.CancellationReason.Error:
                     logger.error(f"Error details: {cancellation_details.error_details}")
+                    # Rebuild on the next turn in case the connection or device went away
+                    self._mic_recognizer = None
                     if "401" in str(cancellation_details.error_details):
                         print("🚨 Authentication error - please check Azure credentials")
                     elif "microphone" in str(cancellation_details.error_details).lower():
@@ -571,7 +1067,7 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             Tuple of (recognized text or None, timing metrics or None)
         """
         try:
-            speech_start_time = time.time()
+            speech_start_time = time.perf_counter()
             
             # Configure audio input from file
             audio_config = speechsdk.AudioConfig(filename=file_path)
@@ -586,17 +1082,9 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             future = recognizer.recognize_once_async()
             result = future.get()
             
-            speech_end_time = time.time()
+            speech_end_time = time.perf_counter()
             
-            timing = TimingMetrics(
-                speech_start_time=speech_start_time,
-                speech_end_time=speech_end_time,
-                ai_processing_start_time=0,
-                ai_processing_end_time=0,
-                tts_start_time=0,
-                tts_end_time=0,
-                voice_playback_start_time=0
-            )
+            timing = TimingMetrics.for_speech(speech_start_time, speech_end_time)
 
             if result is None:
                 logger.error("Speech recognition result is None.")
@@ -625,22 +1113,146 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         """
         Prepare recent conversation history for AI API call
         
+        The system prompt is always sent first, followed by a window of recent
+        messages. The window start only moves in steps of whole exchanges, so
+        the prompt prefix stays byte-identical for several turns in a row and
+        the providers' prompt caches keep hitting.
+        
         Returns:
             List of message dictionaries for API
         """
-        # Get recent messages (last N turns)
-        recent_messages = self.session_memory[-self.max_memory_turns:]
+        # Only the window is copied out of session_memory; it stays the only full history
+        memory = self.session_memory
+        offset, dropped = self._prompt_window()
         
         # Convert to API format
         api_messages = []
-        for msg in recent_messages:
-            api_messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
+        if offset:
+            api_messages.append({"role": "system", "content": memory[0].content})
+            # Older context that no longer fits in the window is carried as a summary
+            if self._history_summary:
+                api_messages.append({
+                    "role": "system",
+                    "content": f"{self.summary_prefix}{self._history_summary}"
+                })
+        api_messages.extend({"role": msg.role, "content": msg.content}
+                            for msg in memory[offset + dropped:])
         
         return api_messages
     
+    def _prompt_window(self) -> Tuple[int, int]:
+        """
+        Locate the messages that no longer fit in the prompt window
+        
+        The oldest messages are dropped in blocks of exchanges (user + assistant
+        pairs) so the window start only moves every few turns.
+        
+        Returns:
+            Tuple of (index of the first non-system message, number of messages dropped after it)
+        """
+        memory = self.session_memory
+        offset = 1 if memory and memory[0].role == "system" else 0
+        step = max(2, (self.max_memory_turns // 2) & ~1)
+        overflow = len(memory) - offset - self.max_memory_turns
+        if overflow <= 0:
+            return offset, 0
+        return offset, -(-overflow // step) * step  # round up to a whole step
+    
+    def _schedule_history_summary(self, offset: int, upto: int):
+        """
+        Summarize messages that left the prompt window on a background thread
+        
+        Args:
+            offset: Index in session_memory of the first non-system message
+            upto: Number of leading non-system messages no longer sent verbatim
+        """
+        if upto <= self._summarized_messages or not self.openai_client:
+            return
+        if self._summary_thread and self._summary_thread.is_alive():
+            return
+        
+        pending = [{"role": msg.role, "content": msg.content}
+                   for msg in self.session_memory[offset + self._summarized_messages:offset + upto]]
+        self._summary_thread = threading.Thread(
+            target=self._summarize_history,
+            args=(self._history_summary, pending, upto, self._session_generation),
+            name="history-summary",
+            daemon=True
+        )
+        self._summary_thread.start()
+    
+    def _summarize_history(self, previous_summary: str, pending: List[Dict[str, str]],
+                           upto: int, generation: int):
+        """Fold pending messages into the session summary (runs off the main thread)"""
+        transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in pending)
+        prompt = (
+            "Summarize this therapy conversation in at most 3 sentences, in the language "
+            "the client uses. Keep the client's concerns, feelings and any safety risks.\n\n"
+            f"Earlier summary: {previous_summary or '-'}\n\nNew messages:\n{transcript}"
+        )
+        try:
+            response = self.openai_client.chat.completions.create(
+                model="gpt-4.1-nano",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.3,
+                max_tokens=200
+            )
+            summary = (response.choices[0].message.content or "").strip()
+        except Exception as e:
+            logger.warning(f"History summary failed: {e}")
+            return
+        
+        # Ignore results that finish after the session was reset
+        if summary and generation == self._session_generation:
+            self._history_summary = summary
+            self._summarized_messages = upto
+            logger.info(f"📝 Session summary updated ({upto} messages)")
+    
+    @staticmethod
+    def _log_prompt_cache(provider: str, usage: Any):
+        """
+        Log how much of the prompt was served from the provider's prompt cache
+        
+        The system prompt is kept byte-identical across turns and the summary
+        follows it as a separate message, so a stable prefix should show up
+        here as cached tokens once the session is warm.
+        
+        Args:
+            provider: "OpenAI" or "Claude"
+            usage: Usage object from the API response
+        """
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        if details is not None:
+            # OpenAI: prompt_tokens includes the cached part
+            cached = getattr(details, 'cached_tokens', 0) or 0
+            total = getattr(usage, 'prompt_tokens', 0) or 0
+        else:
+            # Anthropic: input_tokens excludes cache reads and cache writes
+            cached = getattr(usage, 'cache_read_input_tokens', 0) or 0
+            total = ((getattr(usage, 'input_tokens', 0) or 0) + cached +
+                     (getattr(usage, 'cache_creation_input_tokens', 0) or 0))
+        logger.info(f"🧠 {provider} prompt cache: {cached}/{total} input tokens cached")
+    
+    def _primary_openai_client(self, hedged: bool = False):
+        """
+        Client for the primary chat calls
+        
+        When Claude is available, a 429/5xx/connection error should fall back
+        immediately instead of sitting through the SDK's backoff retries first.
+        Other callers (summary, emotion refinement) have no fallback and keep
+        the default retries on the shared client.
+        
+        Args:
+            hedged: The call races Claude, so it also gets a short read timeout
+        """
+        if self.claude_client is None:
+            return self.openai_client
+        if hedged:
+            return self.openai_client.with_options(max_retries=0, timeout=_HEDGED_PRIMARY_TIMEOUT)
+        return self.openai_client.with_options(max_retries=0)
+    
     def _call_openai_gpt4(self, messages: List[Dict[str, str]]) -> Optional[str]:
         """Call OpenAI GPT-4o API for response"""
         if not self.openai_client:
@@ -652,13 +1264,16 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             
             typed_messages = cast(List[ChatCompletionMessageParam], messages)
             
-            response = self.openai_client.chat.completions.create(
+            hedged = self._openai_executor is not None
+            response = self._primary_openai_client(hedged).chat.completions.create(
                 model="gpt-4.1-mini", ############################################################### gpt-4.1/ gpt-4.1-mini /gpt-4o
                 messages=typed_messages,
                 temperature=0.7,
                 max_tokens=500
             )
             
+            self._log_prompt_cache("OpenAI", response.usage)
+            
             if response.choices and response.choices[0].message:
                 ai_response = response.choices[0].message.content or ""
                 logger.info("✅ OpenAI response received")
@@ -669,6 +1284,40 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         
         return None
 
+    def _prepare_claude_request(self, messages: List[Dict[str, str]]) -> Tuple[List[Any], List[Any]]:
+        """
+        Split prepared messages into Claude's system blocks and conversation
+        
+        The system prompt carries a cache breakpoint so Anthropic can reuse it
+        across turns instead of reprocessing it on every fallback call.
+        
+        Args:
+            messages: Messages from _prepare_messages_for_ai
+            
+        Returns:
+            Tuple of (system content blocks, conversation messages)
+        """
+        # Filter out the system message for Claude if it's the first message
+        if messages and messages[0]['role'] == 'system':
+            system_prompt = messages[0]['content']
+            user_messages = messages[1:]
+        else:
+            system_prompt = self.system_prompt # Default system prompt
+            user_messages = messages
+        
+        system_blocks = [{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }]
+        
+        # Claude only accepts system text in the system parameter (e.g. the session summary)
+        while user_messages and user_messages[0]['role'] == 'system':
+            system_blocks.append({"type": "text", "text": user_messages[0]['content']})
+            user_messages = user_messages[1:]
+        
+        return system_blocks, cast(List[Any], user_messages)
+
     def _call_claude_fallback(self, messages: List[Dict[str, str]]) -> Optional[str]:
         """Fallback to Anthropic Claude 3 Sonnet if OpenAI fails"""
         if not self.claude_client or not anthropic:
@@ -678,24 +1327,18 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         try:
             logger.info("🤖 Calling Anthropic Claude 3 Sonnet (fallback)...")
             
-            # Filter out the system message for Claude if it's the first message
-            if messages and messages[0]['role'] == 'system':
-                system_prompt = messages[0]['content']
-                user_messages = messages[1:]
-            else:
-                system_prompt = self.system_prompt # Default system prompt
-                user_messages = messages
-
-            typed_user_messages = cast(List[Any], user_messages)
+            system_blocks, user_messages = self._prepare_claude_request(messages)
 
             response = self.claude_client.messages.create(
                 model="claude-4-opus-20250520",  # Updated to Claude Opus 4  ###############################################################
-                system=system_prompt,
-                messages=typed_user_messages,
+                system=system_blocks,
+                messages=user_messages,
                 max_tokens=500,  # Increased for better responses
                 temperature=0.7
             )
             
+            self._log_prompt_cache("Claude", response.usage)
+            
             if response.content and isinstance(response.content, list):
                 content_block = response.content[0]
                 if isinstance(content_block, anthropic.types.TextBlock):
@@ -705,23 +1348,84 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
 
         except Exception as e:
             logger.error(f"Anthropic API call failed: {e}")
-            
+
         return None
 
-    def get_ai_response(self, user_input: str, timing_metrics: TimingMetrics) -> Tuple[Optional[str], str]:
+    def _stream_openai_gpt4(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream OpenAI response text deltas as they are generated"""
+        if not self.openai_client:
+            logger.warning("OpenAI client not initialized, cannot make call.")
+            return
+
+        try:
+            logger.info("🤖 Streaming OpenAI GPT-4o...")
+
+            typed_messages = cast(List[ChatCompletionMessageParam], messages)
+
+            stream = self._primary_openai_client().chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=typed_messages,
+                temperature=0.7,
+                max_tokens=500,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if chunk.usage:
+                    self._log_prompt_cache("OpenAI", chunk.usage)
+
+        except Exception as e:
+            logger.error(f"OpenAI streaming call failed: {e}")
+
+    def _stream_claude_fallback(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream Anthropic Claude response text deltas as they are generated"""
+        if not self.claude_client or not anthropic:
+            logger.warning("Anthropic client not available for fallback.")
+            return
+
+        try:
+            logger.info("🤖 Streaming Anthropic Claude (fallback)...")
+
+            system_blocks, user_messages = self._prepare_claude_request(messages)
+
+            with self.claude_client.messages.stream(
+                model="claude-4-opus-20250520",
+                system=system_blocks,
+                messages=user_messages,
+                max_tokens=500,
+                temperature=0.7
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
+                self._log_prompt_cache("Claude", stream.get_final_message().usage)
+
+        except Exception as e:
+            logger.error(f"Anthropic streaming call failed: {e}")
+
+    def _stream_with_fallback(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream from OpenAI, falling back to Claude if OpenAI produced nothing"""
+        produced_output = False
+        for delta in self._stream_openai_gpt4(messages):
+            produced_output = True
+            yield delta
+
+        if not produced_output:
+            logger.info("🔄 Falling back to Claude...")
+            yield from self._stream_claude_fallback(messages)
+
+    def _begin_turn(self, user_input: str) -> Tuple[List[Dict[str, str]], str]:
         """
-        Get AI response with OpenAI primary and Claude fallback
-        
+        Select the system prompt for the user's language and record the user message
+
         Args:
             user_input: User's input text
-            timing_metrics: Timing metrics object to update
-            
+
         Returns:
-            Tuple of (AI response or None if all services failed, detected language)
-.        """
-        # Record AI processing start time
-        timing_metrics.ai_processing_start_time = time.time()
-        
+            Tuple of (messages for the AI call, detected language)
+        """
         # Detect language of user input
         detected_language = self.detect_language(user_input)
         logger.info(f"Detected language: {detected_language} for input: {user_input[:50]}...")
@@ -729,47 +1433,212 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         # Set appropriate system prompt based on detected language
         if detected_language == 'en':  ###############################################################  english
             self.system_prompt = self.system_prompt_english
+            self.summary_prefix = self.summary_prefix_english
             logger.info("Using English system prompt")
         else:   ###############################################################  arabic
             self.system_prompt = self.system_prompt_arabic
+            self.summary_prefix = self.summary_prefix_arabic
             logger.info("Using Arabic system prompt")
         
         # Update system message in session memory if language changed
-        if self.session_memory and self.session_memory[0].role == "system":
-            self.session_memory[0].content = self.system_prompt
+        if (self.session_memory and self.session_memory[0].role == "system"
+                and self.session_memory[0].content != self.system_prompt):
+            self.session_memory[0] = replace(self.session_memory[0], content=self.system_prompt)
         
         # Add user message to session memory
-        self.session_memory.append(ConversationMessage(
+        user_message = ConversationMessage(
             role="user",
             content=user_input,
             timestamp=datetime.now()
-        ))
+        )
+        self.session_memory.append(user_message)
+        self._log_message(user_message)
+        
+        # Fold messages that left the window into the summary (used from a later turn on)
+        offset, dropped = self._prompt_window()
+        if dropped:
+            self._schedule_history_summary(offset, dropped)
         
         # Prepare messages for AI
-        messages = self._prepare_messages_for_ai()
+        return self._prepare_messages_for_ai(), detected_language
+
+    def _lookup_cached_response(self, messages: List[Dict[str, str]]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a cached response for the exact prompt about to be sent
+
+        Returns:
+            Tuple of (cache key or None if caching is disabled, cached response or None)
+        """
+        if not self.response_cache:
+            return None, None
+
+        cache_key = ResponseCache.make_key(messages)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response:
+            logger.info("⚡ AI response served from cache")
+        return cache_key, cached_response
+
+    def _finish_turn(self, ai_response: str):
+        """Record the assistant's reply in session memory"""
+        assistant_message = ConversationMessage(
+            role="assistant",
+            content=ai_response,
+            timestamp=datetime.now(),
+            voice_gender=self.default_voice_gender,
+            emotion=self.default_emotion
+        )
+        self.session_memory.append(assistant_message)
+        self._log_message(assistant_message)
+
+    def _log_message(self, message: ConversationMessage):
+        """Append one message to the JSONL transcript log as soon as it exists, if enabled"""
+        if not self._transcript_log:
+            return
+        try:
+            record = {f.name: getattr(message, f.name) for f in fields(message) if f.init}
+            record["timestamp"] = message.timestamp.isoformat()
+            self._transcript_log.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to write session transcript log: {e}")
+
+    def _call_hedged(self, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Call OpenAI and, if it is slow or fails, Claude in parallel
         
-        # Try OpenAI first
-        ai_response = self._call_openai_gpt4(messages)
+        Claude is started once OpenAI has not answered within ai_hedge_delay
+        seconds (or as soon as OpenAI fails). The first non-empty answer wins;
+        the other call is left to finish in the background on its own
+        provider's pool and its result is discarded (a losing OpenAI call is
+        cut off after _HEDGED_PRIMARY_TIMEOUT).
         
-        # Fallback to Claude if OpenAI fails
-        if not ai_response:
-            logger.info("🔄 Falling back to Claude...")
-            ai_response = self._call_claude_fallback(messages)
+        A delay of 0 starts both providers together (speculative fallback).
+        OpenAI's answer is still preferred if it arrives within
+        _PRIMARY_GRACE_PERIOD seconds, so replies only switch provider when
+        OpenAI is genuinely slow or down.
         
+        Args:
+            messages: Messages from _prepare_messages_for_ai
+            
+        Returns:
+            AI response or None if both providers failed
+        """
+        start = time.perf_counter()
+        primary = self._openai_executor.submit(self._call_openai_gpt4, messages)
+        pending = {primary}
+        if self.ai_hedge_delay:
+            done, pending = wait(pending, timeout=self.ai_hedge_delay)
+            if primary in done and primary.result():
+                return primary.result()
+        
+        logger.info("🔄 Hedging with Claude...")
+        pending.add(self._claude_executor.submit(self._call_claude_fallback, messages))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Both may finish within the same wait; OpenAI's answer is preferred then
+            if primary in done and primary.result():
+                return primary.result()
+            for future in done:
+                if future is primary or not future.result():
+                    continue
+                if primary in pending and not self.ai_hedge_delay:
+                    grace = _PRIMARY_GRACE_PERIOD - (time.perf_counter() - start)
+                    if grace > 0 and wait([primary], timeout=grace).done and primary.result():
+                        return primary.result()
+                return future.result()
+        return None
+
+    def get_ai_response(self, user_input: str, timing_metrics: TimingMetrics) -> Tuple[Optional[str], str]:
+        """
+        Get AI response with OpenAI primary and Claude fallback
+
+        Args:
+            user_input: User's input text
+            timing_metrics: Timing metrics object to update
+
+        Returns:
+            Tuple of (AI response or None if all services failed, detected language)
+        """
+        # Record AI processing start time
+        timing_metrics.ai_processing_start_time = time.perf_counter()
+
+        messages, detected_language = self._begin_turn(user_input)
+
+        # Identical conversation state already answered? Skip the API call
+        cache_key, ai_response = self._lookup_cached_response(messages)
+
+        if not ai_response:
+            if self._openai_executor and self.claude_client:
+                ai_response = self._call_hedged(messages)
+            else:
+                # Try OpenAI first
+                ai_response = self._call_openai_gpt4(messages)
+
+                # Fallback to Claude if OpenAI fails
+                if not ai_response:
+                    logger.info("🔄 Falling back to Claude...")
+                    ai_response = self._call_claude_fallback(messages)
+
+            if ai_response and cache_key:
+                self.response_cache.put(cache_key, ai_response)
+
         # Record AI processing end time
-        timing_metrics.ai_processing_end_time = time.time()
-        
+        timing_metrics.ai_processing_end_time = time.perf_counter()
+
         # If we got a response, add it to memory
         if ai_response:
-            self.session_memory.append(ConversationMessage(
-                role="assistant",
-                content=ai_response,
-                timestamp=datetime.now(),
-                voice_gender=self.default_voice_gender,
-                emotion=self.default_emotion
-            ))
-        
+            self._finish_turn(ai_response)
+
         return ai_response, detected_language
+
+    def stream_ai_response(self, user_input: str,
+                           timing_metrics: TimingMetrics) -> Tuple[str, Iterator[str]]:
+        """
+        Stream the AI response sentence by sentence so TTS can start early
+
+        The response is added to session memory once the iterator is exhausted.
+        ai_processing_end_time marks the first complete sentence, which is
+        what gates the start of speech.
+
+        Args:
+            user_input: User's input text
+            timing_metrics: Timing metrics object to update
+
+        Returns:
+            Tuple of (detected language, iterator of response sentences)
+        """
+        timing_metrics.ai_processing_start_time = time.perf_counter()
+
+        messages, detected_language = self._begin_turn(user_input)
+        cache_key, cached_response = self._lookup_cached_response(messages)
+
+        def sentences() -> Iterator[str]:
+            deltas = iter([cached_response]) if cached_response else self._stream_with_fallback(messages)
+
+            spoken: List[str] = []
+            for sentence in iter_sentences(deltas):
+                if not spoken:
+                    timing_metrics.ai_processing_end_time = time.perf_counter()
+                spoken.append(sentence)
+                yield sentence
+
+            if spoken:
+                ai_response = " ".join(spoken)
+                if cache_key and not cached_response:
+                    self.response_cache.put(cache_key, ai_response)
+                self._finish_turn(ai_response)
+
+        return detected_language, sentences()
+    
+    def _get_emotion_refiner(self):
+        """Return the EmotionRefiner, creating it on first use (None if it cannot be created)"""
+        if self.emotion_refiner is None and self.use_emotion_refinement:
+            try:
+                # Share the main OpenAI client so refinement reuses its warm connections
+                self.emotion_refiner = EmotionRefiner(self.openai_api_key, client=self.openai_client)
+            except Exception as e:
+                logger.warning(f"Failed to initialize EmotionRefiner: {e}")
+                self.use_emotion_refinement = False
+        return self.emotion_refiner
     
     def refine_ai_response_with_emotion(self, ai_response: str, user_input: str, detected_language: str) -> Tuple[str, str]:
         """
@@ -784,7 +1653,7 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         Returns:
             Tuple of (refined_response_text, enhanced_ssml)
         """
-        if not self.use_emotion_refinement or not self.emotion_refiner:
+        if not self.use_emotion_refinement or not self._get_emotion_refiner():
             # Fallback to basic emotion detection
             basic_emotion = self.detect_emotion_from_text(ai_response)
             return ai_response, self._create_ssml_text(ai_response, basic_emotion, language=detected_language)
@@ -841,22 +1710,28 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         if not self.session_memory:
             return 'none'
         
-        # Check last few user messages for crisis indicators
-        recent_user_messages = [msg.content for msg in self.session_memory[-6:] if msg.role == 'user']
-        crisis_keywords = {
-            'severe': ['أريد أن أموت', 'أقتل نفسي', 'suicide', 'kill myself', 'end it all'],
-            'moderate': ['لا أستطيع', 'يائس', 'مكتئب جداً', 'can\'t take it', 'hopeless', 'severely depressed'],
-            'mild': ['حزين', 'قلق', 'صعب', 'sad', 'anxious', 'difficult', 'struggling']
-        }
+        # Every sentence of a streamed reply builds SSML for the same window. The cache holds
+        # the window's message objects themselves: an appended or replaced message (e.g. the
+        # system prompt swapped by _begin_turn) is a different object, and since the cached
+        # ones stay alive their ids cannot be recycled by new messages
+        window = self.session_memory[-6:]
+        cached = self._crisis_cache
+        if cached and len(cached[0]) == len(window) and all(a is b for a, b in zip(cached[0], window)):
+            return cached[1]
         
+        # Check last few user messages for crisis indicators
+        recent_user_messages = [msg.content for msg in window if msg.role == 'user']
         text = ' '.join(recent_user_messages).lower()
         
-        for level, keywords in crisis_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return level
+        # Most severe level first, one compiled search per level
+        crisis_level = 'none'
+        for level, pattern in _CRISIS_LEVEL_RES:
+            if pattern.search(text):
+                crisis_level = level
+                break
         
-        return 'none'
+        self._crisis_cache = (window, crisis_level)
+        return crisis_level
     
     def _assess_therapeutic_stage(self) -> str:
         """Assess current therapeutic stage from conversation length and content"""
@@ -871,14 +1746,7 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
     
     def _get_recent_conversation_for_context(self) -> List[Dict[str, str]]:
         """Get recent conversation history for emotion context"""
-        recent = []
-        for msg in self.session_memory[-8:]:  # Last 8 messages for context
-            recent.append({
-                'role': msg.role,
-                'content': msg.content[:200] + '...' if len(msg.content) > 200 else msg.content,  # Truncate long messages
-                'timestamp': msg.timestamp.isoformat()
-            })
-        return recent
+        return [msg.context_dict() for msg in self.session_memory[-8:]]  # Last 8 messages for context
     
     def _adjust_settings_for_crisis(self, settings: Dict[str, str], crisis_level: str) -> Dict[str, str]:
         """Adjust TTS settings based on crisis level for more appropriate therapeutic tone"""
@@ -908,20 +1776,18 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         if not voice_name:
             voice_name = self.voices[language][self.default_voice_gender]
         
-        # Emotion-specific prosody settings - optimized for natural human-like speech
-        # Based on Azure TTS best practices to avoid chipmunk/robotic effects
-        emotion_settings = {
-            'calm': {'rate': '-5%', 'pitch': '-5%', 'volume': 'soft'},
-            'encouraging': {'rate': '+10%', 'pitch': '+8%', 'volume': 'medium'},
-            'excited': {'rate': '+15%', 'pitch': '+12%', 'volume': 'medium'},  # Reduced from +35%/+25% to avoid chipmunk effect
-            'sad': {'rate': '-10%', 'pitch': '-8%', 'volume': 'soft'},  # Reduced from -20%/-15% to be less robotic
-            'neutral': {'rate': 'medium', 'pitch': 'medium', 'volume': 'medium'}
-        }
+        crisis_level = self._assess_crisis_level()
+        
+        cache_key = None
+        if text in _CANNED_TEXTS:
+            cache_key = (text, emotion, voice_name, language, crisis_level)
+            cached_ssml = self._canned_ssml_cache.get(cache_key)
+            if cached_ssml:
+                return cached_ssml
         
-        settings = emotion_settings.get(emotion, emotion_settings['neutral'])
+        settings = EMOTION_PROSODY.get(emotion, EMOTION_PROSODY['neutral'])
         
         # Crisis-based pitch and tone adjustments
-        crisis_level = self._assess_crisis_level()
         if crisis_level != 'none':
             settings = self._adjust_settings_for_crisis(settings, crisis_level)
         
@@ -934,47 +1800,33 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         # Clean the enhanced text to ensure no malformed SSML tags
         enhanced_text = self._clean_ssml_content(enhanced_text)
         
-        ssml = f"""<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{xml_lang}">
-            <voice name="{voice_name}">
-                <prosody rate="{settings['rate']}" pitch="{settings['pitch']}" volume="{settings['volume']}">
-                    {enhanced_text}
-                </prosody>
-            </voice>
-        </speak>"""
+        # Escape characters that would make the document invalid XML
+        enhanced_text = _SSML_BARE_AMPERSAND_RE.sub('&amp;', enhanced_text)
+        enhanced_text = _SSML_STRAY_LT_RE.sub('&lt;', enhanced_text)
+        
+        # The SSML wrapper only depends on language, voice and prosody, so it is
+        # built once per combination and only the text is substituted per call
+        template_key = (xml_lang, voice_name, settings['rate'], settings['pitch'], settings['volume'])
+        template = self._ssml_templates.get(template_key)
+        if template is None:
+            template = string.Template(_SSML_TEMPLATE.substitute(
+                xml_lang=xml_lang, voice_name=voice_name, rate=settings['rate'],
+                pitch=settings['pitch'], volume=settings['volume'], text='$text'
+            ))
+            self._ssml_templates[template_key] = template
         
-        return ssml.strip()
+        ssml = template.substitute(text=enhanced_text)
+        if cache_key:
+            self._canned_ssml_cache[cache_key] = ssml
+        return ssml
     
     def _clean_ssml_content(self, text: str) -> str:
         """Clean text content to ensure valid SSML structure"""
-        import re
-        
-        # Remove any complete SSML documents that might be embedded
-        text = re.sub(r'<\?xml[^>]*\?>', '', text)  # Remove XML declarations
-        
-        # Remove any stray SSML tags that might cause conflicts
-        text = re.sub(r'</?speak[^>]*>', '', text)  # Remove any speak tags
-        text = re.sub(r'</?voice[^>]*>', '', text)  # Remove any voice tags
-        text = re.sub(r'</?prosody[^>]*>', '', text)  # Remove any prosody tags
-        
-        # Fix malformed break tags (like bbreak)
-        text = re.sub(r'<bbreak\s+time="([^"]+)"\s*/?>', r'<break time="\1"/>', text)
-        text = re.sub(r'<break\s+time=\'([^\']+)\'\s*/?>', r'<break time="\1"/>', text)  # Fix single quotes
-        
-        # Ensure break tags are properly formatted
-        text = re.sub(r'<break\s+time="([^"]+)"\s*/?>', r'<break time="\1"/>', text)
-        
-        # Remove any malformed emphasis tags and replace with proper ones if needed
-        text = re.sub(r'</?emphasis[^>]*>', '', text)
-        
-        # Remove any other potentially problematic SSML tags
-        text = re.sub(r'</?phoneme[^>]*>', '', text)
-        text = re.sub(r'</?say-as[^>]*>', '', text)
-        text = re.sub(r'</?sub[^>]*>', '', text)
+        text = _SSML_STRAY_TAG_RE.sub('', text)
+        text = _SSML_BREAK_RE.sub(lambda match: f'<break time="{match.group(1) or match.group(2)}"/>', text)
         
         # Clean up any double spaces or line breaks
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return ' '.join(text.split())
     
     def _add_natural_pauses(self, text: str, emotion: str) -> str:
         """Add natural pauses and breaks to text based on emotion for more human-like speech
@@ -984,151 +1836,66 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         - Handles both English and Arabic emotional expressions
         - Removes unwanted text markers that would be spoken aloud
         """
-        import re
-        
         # STAGE 1: Handle complex emotion markers from GPT-4.1-nano refinement
         # These need to be converted to SSML breaks instead of being spoken
+        text = _EMOTION_MARKER_RE.sub(lambda match: _EMOTION_MARKER_BREAKS.get(match.group(1).casefold(), ''), text)
         
-        # English emotion markers
-        emotion_patterns = {
-            # Sigh variations
-            r'\*soft sigh\*': '<break time="500ms"/>',
-            r'\*gentle sigh\*': '<break time="450ms"/>',
-            r'\*deep sigh\*': '<break time="600ms"/>',
-            r'\*relieved sigh\*': '<break time="400ms"/>',
-            r'\*tired sigh\*/': '<break time="550ms"/>',
-            r'\*sad sigh\*': '<break time="650ms"/>',
-            r'\*thoughtful sigh\*': '<break time="500ms"/>',
-            r'\*proud sigh\*': '<break time="400ms"/>',
-            
-            # Pause variations
-            r'\*soft pause\*': '<break time="400ms"/>',
-            r'\*gentle pause\*': '<break time="350ms"/>',
-            r'\*thoughtful pause\*': '<break time="500ms"/>',
-            r'\*encouraging pause\*': '<break time="300ms"/>',
-            r'\*reassuring pause\*': '<break time="350ms"/>',
-            r'\*contemplative pause\*': '<break time="550ms"/>',
-            r'\*excited pause\*': '<break time="200ms"/>',
-            r'\*calming pause\*': '<break time="450ms"/>',
-            
-            # Arabic emotion markers
-            r'\*تنهد خفيف\*': '<break time="500ms"/>',  # soft sigh
-            r'\*تنهد عميق\*': '<break time="600ms"/>',  # deep sigh
-            r'\*تنهد حزين\*': '<break time="650ms"/>',  # sad sigh
-            r'\*تنهد مطمئن\*': '<break time="400ms"/>',  # reassuring sigh
-            r'\*وقفة خفيفة\*': '<break time="350ms"/>',  # soft pause
-            r'\*وقفة مطمئنة\*': '<break time="350ms"/>',  # reassuring pause
-            r'\*وقفة متأملة\*': '<break time="500ms"/>',  # contemplative pause
-            r'\*وقفة مشجعة\*': '<break time="300ms"/>',  # encouraging pause
-            r'\*وقفة فرحة\*': '<break time="250ms"/>',  # happy pause
-            r'\*وقفة هادئة\*': '<break time="450ms"/>',  # calm pause
-            
-            # Breathing and grounding markers
-            r'\*deep breath\*': '<break time="700ms"/>',
-            r'\*breathe\*': '<break time="600ms"/>',
-            r'\*inhale\*': '<break time="500ms"/>',
-            r'\*exhale\*': '<break time="500ms"/>',
-            r'\*تنفس عميق\*': '<break time="700ms"/>',  # deep breath
-            r'\*شهيق\*': '<break time="500ms"/>',  # inhale
-            r'\*زفير\*': '<break time="500ms"/>',  # exhale
-            
-            # Voice quality markers that should be removed
-            r'\*whispered\*': '',
-            r'\*softly\*': '',
-            r'\*gently\*': '',
-            r'\*warmly\*': '',
-            r'\*quietly\*': '',
-            r'\*بهمس\*': '',  # whispered
-            r'\*بلطف\*': '',  # gently
-            r'\*بحنان\*': '',  # warmly
-        }
+        # STAGE 2: Handle basic emotion expressions (ellipses, sighs, hesitation markers)
+        for pattern, replacement in _EXPRESSION_PAUSE_SUBS:
+            text = pattern.sub(replacement, text)
         
-        # Apply emotion marker replacements
-        for pattern, replacement in emotion_patterns.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-        
-        # STAGE 2: Handle basic emotion expressions (existing functionality)
-        # Replace ellipsis with natural pauses
-        text = re.sub(r'\.{3,}', '<break time="800ms"/>', text)  # ...
-        text = re.sub(r'_{3,}', '<break time="600ms"/>', text)   # ___
-        
-        # Add breathing/sigh effects for remaining simple emotional moments
-        text = re.sub(r'<sigh>', '<break time="400ms"/>', text)
-        text = re.sub(r'\*sigh\*', '<break time="400ms"/>', text)
-        text = re.sub(r'\(sigh\)', '<break time="400ms"/>', text)
-        
-        # Handle hesitation markers
-        text = re.sub(r'\buh+m+\b', '<break time="300ms"/>um<break time="200ms"/>', text, flags=re.IGNORECASE)
-        text = re.sub(r'\bah+\b', '<break time="250ms"/>ah<break time="150ms"/>', text, flags=re.IGNORECASE)
-        text = re.sub(r'\bwell\b', 'well<break time="200ms"/>', text, flags=re.IGNORECASE)
-        text = re.sub(r'\byou know\b', 'you know<break time="150ms"/>', text, flags=re.IGNORECASE)
-        
-        # Arabic hesitation markers
-        text = re.sub(r'\bيعني\b', 'يعني<break time="200ms"/>', text)  # "I mean"
-        text = re.sub(r'\bأه\b', 'أه<break time="150ms"/>', text)     # "ah"
-        text = re.sub(r'\bإم\b', 'إم<break time="200ms"/>', text)     # "um"
-        
-        # STAGE 3: Emotion-specific pause adjustments (existing functionality enhanced)
-        if emotion == 'excited':
-            # Quick, energetic pauses
-            text = re.sub(r'([.!?])\s+', r'\1<break time="150ms"/> ', text)
-            text = re.sub(r'(,)\s+', r'\1<break time="100ms"/> ', text)
-        elif emotion in ['calm', 'sad']:
-            # Longer, contemplative pauses
-            text = re.sub(r'([.!?])\s+', r'\1<break time="400ms"/> ', text)
-            text = re.sub(r'(,)\s+', r'\1<break time="250ms"/> ', text)
-        else:
-            # Default: moderate pauses
-            text = re.sub(r'([.!?])\s+', r'\1<break time="300ms"/> ', text)
-            text = re.sub(r'(,)\s+', r'\1<break time="150ms"/> ', text)
-        
-        # STAGE 4: Clean up any remaining unwanted markers
-        # Remove any remaining asterisk markers that weren't caught above
-        text = re.sub(r'\*[^*]*\*', '', text)  # Remove any remaining *text* patterns
-        text = re.sub(r'\([^)]*pause[^)]*\)', '<break time="300ms"/>', text, flags=re.IGNORECASE)  # (pause variations)
-        text = re.sub(r'\([^)]*sigh[^)]*\)', '<break time="400ms"/>', text, flags=re.IGNORECASE)  # (sigh variations)
+        # STAGE 3: Emotion-specific pause adjustments
+        sentence_pause, comma_pause = _PUNCTUATION_PAUSES.get(emotion, _PUNCTUATION_PAUSES['neutral'])
+        text = _SENTENCE_END_PAUSE_RE.sub(rf'\1<break time="{sentence_pause}"/> ', text)
+        text = _COMMA_PAUSE_RE.sub(rf'\1<break time="{comma_pause}"/> ', text)
         
-        # Clean up multiple consecutive breaks
-        text = re.sub(r'(<break time="[^"]*"/>\s*){2,}', r'<break time="600ms"/>', text)
+        # STAGE 4: Clean up any remaining unwanted markers and repeated breaks
+        for pattern, replacement in _LEFTOVER_MARKER_SUBS:
+            text = pattern.sub(replacement, text)
         
         # Clean up extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return ' '.join(text.split())
     
     def speak_text(self, text: str, voice_gender: str = "female", 
                    emotion: str = "neutral", timing_metrics: Optional[TimingMetrics] = None, 
-                   return_bytes: bool = False, language: str = "ar"):
+                   return_bytes: bool = False, language: str = "ar", compressed: bool = False):
         try:
             logger.info(f"🔊 TTS Request - Language: {language}, Voice: {voice_gender}, Emotion: {emotion}")
             logger.info(f"🔊 TTS Text: {text[:100]}...")
             
             if timing_metrics:
-                timing_metrics.tts_start_time = time.time()
+                timing_metrics.tts_start_time = time.perf_counter()
             
             # Get voice name
             voice_name = self.voices[language].get(voice_gender, self.voices[language]['female'])
             logger.info(f"🔊 Selected voice: {voice_name}")
             
-            # Set voice in config
-            self.tts_config.speech_synthesis_voice_name = voice_name
-            
-            # Create SSML
+            # Create SSML (the voice is selected by its <voice> element, so the
+            # shared synthesizers' config is never mutated per call)
             ssml_text = self._create_ssml_text(text, emotion, voice_name, language)
             logger.info(f"🔊 Generated SSML: {ssml_text[:200]}...")
             
-            # Create synthesizer
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.tts_config,
-                audio_config=None
-            )
+            # Local playback always uses compressed audio; returned bytes stay WAV unless asked
+            use_compressed = compressed or not return_bytes
+            
+            # Same SSML already synthesized (e.g. a repeated sentence)? Skip Azure
+            audio_key = AudioCache.make_key(ssml_text, "mp3" if use_compressed else "wav")
+            cached_audio = self.audio_cache.get(audio_key)
+            if cached_audio:
+                logger.info("🔊 TTS cache hit")
+                if timing_metrics:
+                    timing_metrics.tts_end_time = time.perf_counter()
+                if return_bytes:
+                    return cached_audio
+                self._play_audio(cached_audio, timing_metrics)
+                return True
             
-            # Perform synthesis
+            # Perform synthesis on the cached synthesizer
             logger.info("🔊 Starting TTS synthesis...")
-            result = synthesizer.speak_ssml_async(ssml_text).get()
+            result = self._synthesize_ssml(ssml_text, compressed=use_compressed)
             
             if timing_metrics:
-                timing_metrics.tts_end_time = time.time()
+                timing_metrics.tts_end_time = time.perf_counter()
             
             if result is None:
                 logger.error("❌ TTS synthesis result is None.")
@@ -1140,21 +1907,15 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
                 logger.info("✅ TTS synthesis successful")
                 audio_size = len(result.audio_data) if result.audio_data else 0
                 logger.info(f"🔊 Audio data size: {audio_size} bytes")
+                if result.audio_data:
+                    self.audio_cache.put(audio_key, result.audio_data)
                 
                 if return_bytes:
                     logger.info("🔊 Returning audio bytes")
                     return result.audio_data
                 else:
                     if result.audio_data:
-                        logger.info("🔊 Playing audio via pygame")
-                        if timing_metrics:
-                            timing_metrics.voice_playback_start_time = time.time()
-                        audio_stream = io.BytesIO(result.audio_data)
-                        pygame.mixer.music.load(audio_stream)
-                        pygame.mixer.music.play()
-                        while pygame.mixer.music.get_busy():
-                            pygame.time.wait(100)
-                        logger.info("🔊 Audio playback completed")
+                        self._play_audio(result.audio_data, timing_metrics)
                     else:
                         logger.error("❌ No audio data in result")
                         return False
@@ -1174,6 +1935,132 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             print(f"🚨 Speech synthesis error: {e}")
             return False
     
+    def _get_tts_executor(self) -> ThreadPoolExecutor:
+        """Return the pool used to synthesize streamed sentences, creating it on first use"""
+        if self._tts_executor is None:
+            self._tts_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="tts")
+        return self._tts_executor
+    
+    def _ensure_mixer(self):
+        """Initialize the pygame mixer on first local playback"""
+        if not pygame.mixer.get_init():
+            with self._mixer_lock:
+                if not pygame.mixer.get_init():
+                    # Mono 48 kHz matches the synthesized audio, so no resampling or upmix;
+                    # a 2048-sample buffer (~43 ms) avoids underruns while the TTS pool is busy
+                    pygame.mixer.init(frequency=48000, size=-16, channels=1, buffer=2048)
+    
+    def _decode_audio(self, audio_data: bytes):
+        """Decode synthesized audio (WAV or MP3) into a pygame Sound"""
+        self._ensure_mixer()
+        return pygame.mixer.Sound(file=io.BytesIO(audio_data))
+    
+    def _play_audio(self, audio_data: bytes, timing_metrics: Optional[TimingMetrics] = None):
+        """Play synthesized audio through pygame, blocking until playback finishes"""
+        self._play_sound(self._decode_audio(audio_data), timing_metrics)
+    
+    def _play_sound(self, sound, timing_metrics: Optional[TimingMetrics] = None):
+        """Play a decoded Sound, blocking until playback finishes"""
+        logger.info("🔊 Playing audio via pygame")
+        # A decoded Sound has an exact clip length, so we can sleep once for
+        # the whole clip instead of polling the mixer every 100 ms
+        if timing_metrics:
+            timing_metrics.voice_playback_start_time = time.perf_counter()
+        channel = sound.play()
+        time.sleep(sound.get_length())
+        while channel is not None and channel.get_busy():
+            pygame.time.wait(5)
+        logger.info("🔊 Audio playback completed")
+    
+    def speak_text_streaming(self, text: str, emotion: Optional[str] = None,
+                             language: str = "ar") -> bool:
+        """
+        Speak a complete text sentence by sentence
+        
+        The first sentence starts playing as soon as it is synthesized while
+        the rest are synthesized in the background, so time to first audio
+        depends on the first sentence rather than the whole text.
+        
+        Args:
+            text: Text to speak
+            emotion: Emotion for the voice, defaults to the session emotion
+            language: Language of the text for voice selection
+            
+        Returns:
+            Whether any audio was played
+        """
+        _, played = self.speak_sentences(iter_sentences(iter([text])), None, language, emotion)
+        return played
+    
+    def speak_sentences(self, sentences: Iterator[str], timing_metrics: Optional[TimingMetrics],
+                        language: str = "ar", emotion: Optional[str] = None) -> Tuple[int, bool]:
+        """
+        Speak a stream of sentences through a three-stage pipeline
+        
+        The AI stream is drained on a background thread and each sentence is
+        synthesized and decoded on the TTS pool while this thread plays audio,
+        so the following sentences are usually ready before they are needed.
+        
+        Args:
+            sentences: Sentences in speaking order (e.g. from stream_ai_response)
+            timing_metrics: Turn metrics; TTS and playback times come from the first sentence
+            language: Language of the response for voice selection
+            emotion: Emotion for the voice, defaults to the session emotion
+            
+        Returns:
+            Tuple of (number of sentences received, whether any audio was played)
+        """
+        # Sentences are synthesized concurrently on the TTS pool; futures are
+        # queued in speaking order so playback order never depends on which
+        # synthesis finishes first. The bound limits how far ahead we synthesize.
+        future_queue: "queue.Queue[Optional[Future]]" = queue.Queue(maxsize=3)
+        executor = self._get_tts_executor()
+        received = [0]
+        
+        def synthesize(sentence: str, sentence_timing: Optional[TimingMetrics]):
+            audio = self.speak_text(sentence, self.default_voice_gender, emotion or self.default_emotion,
+                                    sentence_timing, return_bytes=True, language=language,
+                                    compressed=True)
+            if not isinstance(audio, (bytes, bytearray)) or not audio:
+                return None
+            try:
+                return self._decode_audio(bytes(audio))
+            except Exception as e:
+                logger.error(f"❌ Audio decode error: {e}")
+                return None
+        
+        def read_sentences():
+            try:
+                for sentence in sentences:
+                    # Only the first sentence's TTS defines the turn's latency metrics
+                    sentence_timing = timing_metrics if received[0] == 0 else None
+                    received[0] += 1
+                    future_queue.put(executor.submit(synthesize, sentence, sentence_timing))
+            except Exception as e:
+                logger.error(f"AI stream error: {e}")
+            finally:
+                future_queue.put(None)
+        
+        reader = threading.Thread(target=read_sentences, name="ai-stream", daemon=True)
+        reader.start()
+        
+        played = False
+        while True:
+            future = future_queue.get()
+            if future is None:
+                break
+            try:
+                sound = future.result()
+                if sound is not None:
+                    self._play_sound(sound, None if played else timing_metrics)
+                    played = True
+            except Exception as e:
+                logger.error(f"❌ Audio playback error: {e}")
+        
+        reader.join()
+        
+        return received[0], played
+    
     def get_timing_statistics(self) -> Dict[str, float]:
         """
         Get timing statistics from all recorded conversations
@@ -1181,24 +2068,43 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         Returns:
             Dictionary with timing statistics
         """
-        if not self.timing_history:
+        totals = self._timing_totals
+        count = int(totals.get('count', 0))
+        if not count:
             return {}
         
-        total_latencies = [t.total_latency for t in self.timing_history]
-        stt_durations = [t.stt_duration for t in self.timing_history]
-        ai_durations = [t.ai_processing_duration for t in self.timing_history]
-        tts_durations = [t.tts_duration for t in self.timing_history]
-        
         return {
-            'total_conversations': len(self.timing_history),
-            'avg_total_latency': sum(total_latencies) / len(total_latencies),
-            'min_total_latency': min(total_latencies),
-            'max_total_latency': max(total_latencies),
-            'avg_stt_duration': sum(stt_durations) / len(stt_durations),
-            'avg_ai_duration': sum(ai_durations) / len(ai_durations),
-            'avg_tts_duration': sum(tts_durations) / len(tts_durations)
+            'total_conversations': count,
+            'avg_total_latency': totals['total'] / count,
+            'min_total_latency': totals['min_total'],
+            'max_total_latency': totals['max_total'],
+            'avg_stt_duration': totals['stt'] / count,
+            'avg_ai_duration': totals['ai'] / count,
+            'avg_tts_duration': totals['tts'] / count
         }
     
+    def record_timing(self, timing_metrics: TimingMetrics):
+        """
+        Add a completed turn's timing to the history and running aggregates
+        
+        Args:
+            timing_metrics: Fully populated metrics for the turn
+        """
+        total_latency = timing_metrics.total_latency
+        totals = self._timing_totals
+        if not totals:
+            totals.update(count=0, total=0.0, stt=0.0, ai=0.0, tts=0.0,
+                          min_total=total_latency, max_total=total_latency)
+        
+        self.timing_history.append(timing_metrics)
+        totals['count'] += 1
+        totals['total'] += total_latency
+        totals['stt'] += timing_metrics.stt_duration
+        totals['ai'] += timing_metrics.ai_processing_duration
+        totals['tts'] += timing_metrics.tts_duration
+        totals['min_total'] = min(totals['min_total'], total_latency)
+        totals['max_total'] = max(totals['max_total'], total_latency)
+    
     def print_timing_statistics(self):
         """Print comprehensive timing statistics"""
         stats = self.get_timing_statistics()
@@ -1235,38 +2141,42 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"therapy_session_{timestamp}.txt"
         
+        # Build the whole document first and write it in one call
+        parts = [
+            "Omani Therapist AI - Session Transcript\n",
+            "=" * 50 + "\n",
+            f"Session Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Total Messages: {len(self.session_memory)}\n",
+            "=" * 50 + "\n\n"
+        ]
+        
+        for i, msg in enumerate(self.session_memory, 1):
+            if msg.role != "system":  # Skip system message in transcript
+                parts.append(f"[{i}] {msg.role.upper()} ({msg.timestamp.strftime('%H:%M:%S')})\n{msg.content}\n")
+                if msg.voice_gender or msg.emotion:
+                    parts.append(f"    Voice: {msg.voice_gender}, Emotion: {msg.emotion}\n")
+                parts.append("\n")
+        
+        # Add timing statistics
+        parts.append("\n" + "=" * 50 + "\nTIMING PERFORMANCE STATISTICS\n" + "=" * 50 + "\n")
+        
+        stats = self.get_timing_statistics()
+        if stats:
+            parts.append(
+                f"Total Conversations: {stats['total_conversations']}\n"
+                f"Average Total Latency: {stats['avg_total_latency']:.2f}s\n"
+                f"Best Response Time: {stats['min_total_latency']:.2f}s\n"
+                f"Worst Response Time: {stats['max_total_latency']:.2f}s\n"
+                f"Average STT Duration: {stats['avg_stt_duration']:.2f}s\n"
+                f"Average AI Duration: {stats['avg_ai_duration']:.2f}s\n"
+                f"Average TTS Duration: {stats['avg_tts_duration']:.2f}s\n"
+            )
+        else:
+            parts.append("No timing data available\n")
+        
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write("Omani Therapist AI - Session Transcript\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"Session Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total Messages: {len(self.session_memory)}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                for i, msg in enumerate(self.session_memory, 1):
-                    if msg.role != "system":  # Skip system message in transcript
-                        f.write(f"[{i}] {msg.role.upper()} ({msg.timestamp.strftime('%H:%M:%S')})\n")
-                        f.write(f"{msg.content}\n")
-                        if msg.voice_gender or msg.emotion:
-                            f.write(f"    Voice: {msg.voice_gender}, Emotion: {msg.emotion}\n")
-                        f.write("\n")
-                
-                # Add timing statistics
-                f.write("\n" + "=" * 50 + "\n")
-                f.write("TIMING PERFORMANCE STATISTICS\n")
-                f.write("=" * 50 + "\n")
-                
-                stats = self.get_timing_statistics()
-                if stats:
-                    f.write(f"Total Conversations: {stats['total_conversations']}\n")
-                    f.write(f"Average Total Latency: {stats['avg_total_latency']:.2f}s\n")
-                    f.write(f"Best Response Time: {stats['min_total_latency']:.2f}s\n")
-                    f.write(f"Worst Response Time: {stats['max_total_latency']:.2f}s\n")
-                    f.write(f"Average STT Duration: {stats['avg_stt_duration']:.2f}s\n")
-                    f.write(f"Average AI Duration: {stats['avg_ai_duration']:.2f}s\n")
-                    f.write(f"Average TTS Duration: {stats['avg_tts_duration']:.2f}s\n")
-                else:
-                    f.write("No timing data available\n")
+                f.write("".join(parts))
             
             logger.info(f"Session transcript saved to: {filename}")
             return filename
@@ -1279,6 +2189,11 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         """Reset conversation session"""
         self.session_memory.clear()
         self.timing_history.clear()
+        self._timing_totals.clear()
+        self._history_summary = ""
+        self._summarized_messages = 0
+        self._session_generation += 1
+        self._crisis_cache = None
         # Re-add system message
         self.session_memory.append(ConversationMessage(
             role="system",
@@ -1287,9 +2202,12 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         ))
         logger.info("Session reset")
     
-    def run_conversation_loop(self):
+    def run_conversation_loop(self, speak_welcome: bool = True):
         """
         Main conversation loop with timing measurements
+        
+        Args:
+            speak_welcome: Synthesize the welcome message; when False it is only printed
         """
         print("🇴🇲 Omani Therapist AI - Conversation Started")
         print("=" * 60)
@@ -1301,8 +2219,10 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
         print("=" * 60)
         
         # Welcome message
-        welcome_msg = "أهلاً وسهلاً بك في جلسة العلاج النفسي. أنا هنا لمساعدتك والاستماع إليك. كيف حالك اليوم؟"
-        self.speak_text(welcome_msg, self.default_voice_gender, "encouraging")
+        if speak_welcome:
+            self.speak_text_streaming(WELCOME_MESSAGE, "encouraging")
+        else:
+            print(f"🤖 {WELCOME_MESSAGE}")
         
         conversation_count = 0
         
@@ -1318,15 +2238,14 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
                     continue
                 
                 # Check for exit commands
-                if any(word in user_input.lower() for word in ['انتهى', 'exit', 'bye', 'وداعا']):
+                if _EXIT_COMMAND_RE.search(user_input):
                     print("👋 Ending session...")
                     
                     # Print final timing statistics
                     self.print_timing_statistics()
                     
                     # Farewell message
-                    farewell_msg = "شكراً لك على الجلسة. أتمنى أن تكون مفيدة. إلى اللقاء، وأتمنى لك كل الخير."
-                    self.speak_text(farewell_msg, self.default_voice_gender, "calm")
+                    self.speak_text_streaming(FAREWELL_MESSAGE, "calm")
                     
                     # Save transcript
                     transcript_file = self.save_session_transcript()
@@ -1336,27 +2255,29 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
                     break
                 
                 # Check for reset command
-                if any(word in user_input.lower() for word in ['بداية جديدة', 'reset', 'start over']):
+                if _RESET_COMMAND_RE.search(user_input):
                     print("🔄 Resetting conversation...")
                     self.reset_session()
                     
-                    reset_msg = "حسناً، لنبدأ من جديد. كيف يمكنني مساعدتك اليوم؟"
-                    self.speak_text(reset_msg, self.default_voice_gender, "encouraging")
+                    self.speak_text_streaming(RESET_MESSAGE, "encouraging")
                     conversation_count = 0
                     continue
                 
-                # Get AI response with timing
-                ai_response, detected_language = self.get_ai_response(user_input, timing_metrics)
+                # Connect a playback synthesizer while the AI is still thinking, so the
+                # first sentence does not pay for synthesizer setup and the TLS handshake
+                self._get_tts_executor().submit(self._prewarm_playback_synthesizer)
                 
-                if ai_response:
-                    # Speak the response with timing
-                    success = self.speak_text(ai_response, self.default_voice_gender, self.default_emotion, timing_metrics, language=detected_language)
-                    
+                # Stream the AI response and speak each sentence as soon as it is complete
+                detected_language, sentences = self.stream_ai_response(user_input, timing_metrics)
+
+                spoken_sentences, success = self.speak_sentences(sentences, timing_metrics, detected_language)
+
+                if spoken_sentences:
                     if success:
                         conversation_count += 1
                         
                         # Add completed timing metrics to history
-                        self.timing_history.append(timing_metrics)
+                        self.record_timing(timing_metrics)
                         
                         # Print timing report for this turn
                         timing_metrics.print_timing_report()
@@ -1369,11 +2290,10 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
                 else:
                     print("🚨 Failed to get AI response")
                     # Fallback response
-                    fallback_msg = "أعتذر، لم أتمكن من فهم طلبك. هل يمكنك إعادة السؤال؟"
-                    self.speak_text(fallback_msg, self.default_voice_gender, "neutral")
+                    self.speak_text_streaming(FALLBACK_MESSAGE, "neutral")
                 
-                # Brief pause between turns
-                time.sleep(0.5)
+                # Playback blocks until the last clip has finished, so listening
+                # starts again right away instead of after a fixed pause
                 
         except KeyboardInterrupt:
             print("\n🛑 Conversation interrupted by user")
@@ -1396,12 +2316,24 @@ Always be empathetic, professional, and respectful of Omani and Islamic culture.
 
 def main():
     """Main function to run the Omani Therapist AI"""
+    parser = argparse.ArgumentParser(description="Omani Therapist AI - Conversation System")
+    parser.add_argument('--skip-welcome', action='store_true',
+                        help="print the welcome message instead of synthesizing it (faster startup)")
+    args = parser.parse_args()
+    
     print("Omani Therapist AI - Conversation System")
     print("=" * 50)
     
-    # Check environment variables
-    required_vars = ['AZURE_SPEECH_KEY']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    # Check environment variables in one pass so every missing key is reported together
+    config = load_config()
+    has_openai = bool(config.openai_api_key)
+    has_anthropic = bool(config.anthropic_api_key)
+    
+    missing_vars = []
+    if not config.azure_speech_key:
+        missing_vars.append('AZURE_SPEECH_KEY')
+    if not (has_openai or has_anthropic):
+        missing_vars.append('OPENAI_API_KEY or ANTHROPIC_API_KEY')
     
     if missing_vars:
         print("❌ Missing required environment variables:")
@@ -1415,18 +2347,21 @@ def main():
         return
     
     # Optional API keys warnings
-    if not os.getenv('OPENAI_API_KEY'):
+    if not has_openai:
         print("⚠️  Warning: OPENAI_API_KEY not set - only Claude fallback available")
     
-    if not os.getenv('ANTHROPIC_API_KEY'):
+    if not has_anthropic:
         print("⚠️  Warning: ANTHROPIC_API_KEY not set - no fallback if OpenAI fails")
     
+    # Keep console logging off the audio threads during the voice loop
+    _start_background_logging()
+    
     try:
         # Initialize the AI system
         therapist_ai = OmaniTherapistAI()
         
         # Run the conversation loop
-        therapist_ai.run_conversation_loop()
+        therapist_ai.run_conversation_loop(speak_welcome=not args.skip_welcome)
         
     except Exception as e:
         logger.error(f"System initialization error: {e}")
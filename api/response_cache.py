@@ -0,0 +1,258 @@
+"""
+Persistent AI Response and TTS Audio Caches
+===========================================
+
+Exact-match cache for AI responses, stored in SQLite:
+- Keys are SHA-256 hashes of the full prompt (system prompt + conversation window)
+- User text is normalized before hashing (diacritics, tatweel, whitespace, case),
+  so STT variations of the same utterance share one entry
+- A hit is only possible for an equivalent conversation state, so cached replies
+  are never served out of context
+- An in-memory LRU sits in front of SQLite for repeated lookups in one process
+- WAL journaling allows the API server and local tools to share one cache file
+- Synthesized audio is cached by SSML hash, in memory and optionally on disk,
+  both tiers bounded by total size
+
+Author: AI Assistant
+Created: 2025
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TATWEEL = '\u0640'
+
+
+class ResponseCache:
+    """
+    SQLite-backed exact-match cache of AI responses keyed by prompt hash
+    """
+
+    def __init__(self, db_path: str, memory_size: int = 256):
+        """
+        Open (or create) the cache database
+
+        Args:
+            db_path: Path of the SQLite file
+            memory_size: Number of entries kept in the in-memory LRU
+        """
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts REAL)"
+        )
+        self._conn.commit()
+
+        logger.info(f"AI response cache opened: {db_path}")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def normalize_text(text: str) -> str:
+        """
+        Strip diacritics and tatweel, collapse whitespace and casefold Latin text
+
+        NFKD also splits hamza/madda off alef (أ إ آ -> ا), so alef spellings match.
+        Memoized because every turn re-normalizes the user messages still in the window.
+        """
+        decomposed = unicodedata.normalize('NFKD', text)
+        stripped = ''.join(
+            ch for ch in decomposed
+            if ch != TATWEEL and not unicodedata.combining(ch)
+        )
+        return ' '.join(stripped.split()).casefold()
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, str]]) -> str:
+        """Hash the complete prompt that would be sent to the AI provider"""
+        normalized = [
+            {"role": msg["role"], "content": ResponseCache.normalize_text(msg["content"])}
+            if msg["role"] == "user" else msg
+            for msg in messages
+        ]
+        payload = json.dumps(normalized, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, response: str):
+        """Insert into the in-memory LRU; caller holds the lock"""
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                self._remember(key, row[0])
+        return row[0] if row else None
+
+    def put(self, key: str, response: str):
+        """Store a response for a key, replacing any previous entry"""
+        with self._lock:
+            self._remember(key, response)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class AudioCache:
+    """
+    LRU cache of synthesized speech keyed by SSML hash, optionally backed by a directory
+
+    Both tiers are bounded by total bytes. Whole replies are a few MB of audio and
+    are rarely repeated, so clips larger than a quarter of the memory budget are
+    only kept on disk; the directory drops its least recently used files once it
+    outgrows its budget.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 max_memory_bytes: int = 16 * 1024 * 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        """
+        Create the cache
+
+        Args:
+            directory: Folder for persistent audio files, or None for memory only
+            max_memory_bytes: Total size of the clips kept in memory
+            max_disk_bytes: Total size of the files kept in the directory
+        """
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+            logger.info(f"TTS audio cache directory: {directory} ({self._disk_bytes // 1024} KB)")
+
+    @staticmethod
+    def make_key(ssml_text: str, audio_format: str) -> str:
+        """Hash the SSML document together with the requested output format"""
+        return hashlib.sha256(f"{audio_format}\n{ssml_text}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for a key, or None on a miss"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                audio = f.read()
+            os.utime(path)  # Mark as recently used for eviction
+        except OSError:
+            return None
+
+        with self._lock:
+            self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: bytes):
+        """Store audio for a key"""
+        with self._lock:
+            self._remember(key, audio)
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+                # Write then rename so concurrent readers never see a partial file
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(audio)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Failed to write TTS cache file: {e}")
+                return
+
+            with self._lock:
+                self._disk_bytes += len(audio) - previous_size
+                over_budget = self._disk_bytes > self.max_disk_bytes
+            if over_budget:
+                self._evict_disk()
+
+    def _remember(self, key: str, audio: bytes):
+        """Insert into the in-memory LRU; caller holds the lock"""
+        if len(audio) > self.max_memory_bytes // 4:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_entries(self) -> List[Tuple[float, str, int]]:
+        """(mtime, path, size) of every cached file in the directory"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.audio'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _evict_disk(self):
+        """Delete least recently used files until the directory is back to 3/4 of its budget"""
+        try:
+            entries = sorted(self._disk_entries())
+        except OSError as e:
+            logger.warning(f"Failed to scan TTS cache directory: {e}")
+            return
+
+        total = sum(size for _, _, size in entries)
+        target = self.max_disk_bytes * 3 // 4
+        for _, path, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
@@ -60,7 +60,10 @@ class VoiceActivityDetector:
         self.speech_segments: List[SpeechSegment] = []
         self.last_speech_time: Optional[float] = None
         self.turn_start_time: Optional[float] = None
-        self.current_turn_text: str = ""
+        # Final segments of the current turn; joined only when the text is read
+        self._turn_parts: List[str] = []
+        self._turn_text_length: int = 0
+        self._turn_text: Optional[str] = ""
         self.silence_timer_task: Optional[asyncio.Task] = None
         self.is_processing: bool = False
         self.turn_complete_callback: Optional[Callable[[str, List[SpeechSegment]], Union[None, Awaitable[None]]]] = None
@@ -72,6 +75,13 @@ class VoiceActivityDetector:
         
         logger.info(f"VAD initialized with config: {self.config}")
     
+    @property
+    def current_turn_text(self) -> str:
+        """Text accumulated in the current turn (final segments joined by spaces)"""
+        if self._turn_text is None:
+            self._turn_text = " ".join(self._turn_parts)
+        return self._turn_text
+    
     def set_turn_complete_callback(self, callback: Callable[[str, List[SpeechSegment]], Union[None, Awaitable[None]]]):
         """Set callback function to call when a turn is complete"""
         self.turn_complete_callback = callback
@@ -105,17 +115,20 @@ class VoiceActivityDetector:
         # Update current turn text
         if is_final:
             # For final segments, add to accumulated text
-            if text.strip():
-                if self.current_turn_text:
-                    self.current_turn_text += " " + text.strip()
-                else:
-                    self.current_turn_text = text.strip()
+            stripped = text.strip()
+            if stripped:
+                # Appending instead of concatenating keeps long turns linear
+                if self._turn_parts:
+                    self._turn_text_length += 1
+                self._turn_parts.append(stripped)
+                self._turn_text_length += len(stripped)
+                self._turn_text = None
                 
                 self.speech_segments.append(segment)
                 self.last_speech_time = current_time
                 
                 if self.config.debug_logging:
-                    logger.info(f"📝 Added final segment: '{text}' (total: '{self.current_turn_text}')")
+                    logger.info(f"📝 Added final segment: '{text}' (total: {self._turn_text_length} chars)")
                 
                 # Reset silence timer only for non-empty speech
                 await self._reset_silence_timer()
@@ -162,11 +175,11 @@ class VoiceActivityDetector:
     
     def _should_process_turn(self) -> bool:
         """Determine if the current turn should be processed"""
-        if not self.current_turn_text.strip():
+        if not self._turn_parts:
             return False
         
         # Check minimum speech content length (at least 3 characters for meaningful speech)
-        if len(self.current_turn_text.strip()) < 3:
+        if self._turn_text_length < 3:
             return False
         
         # Check if we've exceeded maximum turn duration
@@ -201,7 +214,7 @@ class VoiceActivityDetector:
                 logger.info(f"📊 Stats: Turn #{self.total_turns}, Avg length: {self.average_turn_length:.1f}s")
             
             # Call the callback with the complete turn
-            if self.turn_complete_callback and self.current_turn_text.strip():
+            if self.turn_complete_callback and self._turn_parts:
                 result = self.turn_complete_callback(self.current_turn_text, self.speech_segments.copy())
                 if asyncio.iscoroutine(result):
                     await result
@@ -215,7 +228,9 @@ class VoiceActivityDetector:
     def _reset_turn_state(self):
         """Reset state for the next conversation turn"""
         self.speech_segments.clear()
-        self.current_turn_text = ""
+        self._turn_parts.clear()
+        self._turn_text_length = 0
+        self._turn_text = ""
         self.turn_start_time = None
         self.last_speech_time = None
         
@@ -226,7 +241,7 @@ class VoiceActivityDetector:
     
     async def force_complete_turn(self):
         """Force completion of the current turn (useful for manual triggers)"""
-        if self.current_turn_text.strip():
+        if self._turn_parts:
             await self._complete_turn()
     
     def get_current_turn_preview(self) -> str:
@@ -239,7 +254,7 @@ class VoiceActivityDetector:
             "total_turns": self.total_turns,
             "total_speech_duration": self.total_speech_duration,
             "average_turn_length": self.average_turn_length,
-            "current_turn_length": len(self.current_turn_text),
+            "current_turn_length": self._turn_text_length,
             "is_processing": self.is_processing,
             "has_active_turn": self.turn_start_time is not None
         }
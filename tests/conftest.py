@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the OmaniTherapistAI unit tests
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import dataclasses
+import pytest
+from unittest.mock import MagicMock
+import omani_therapist_ai
+from omani_therapist_ai import OmaniTherapistAI, ServiceConfig
+
+# Credentials are placeholders: no provider clients are built and Azure is mocked
+TEST_CONFIG = ServiceConfig(
+    azure_speech_key="test-key",
+    azure_region="uaenorth",
+    openai_api_key=None,
+    anthropic_api_key=None,
+    response_cache_path=None,
+    transcript_log_path=None,
+    ai_hedge_delay=None,
+    tts_cache_dir=None
+)
+
+@pytest.fixture
+def make_therapist(monkeypatch):
+    """
+    Build OmaniTherapistAI through its real __init__ without network or audio devices
+
+    Keyword arguments override fields of TEST_CONFIG (e.g. ai_hedge_delay=0.1).
+    Provider clients are left unset; tests assign fakes where they need them.
+    """
+    created = []
+    monkeypatch.setattr(omani_therapist_ai, "speechsdk", MagicMock())
+
+    def make(**overrides):
+        config = dataclasses.replace(TEST_CONFIG, **overrides)
+        monkeypatch.setattr(omani_therapist_ai, "load_config", lambda: config)
+        ai = OmaniTherapistAI()
+        created.append(ai)
+        return ai
+
+    yield make
+
+    for ai in created:
+        for executor in (ai._openai_executor, ai._claude_executor, ai._tts_executor):
+            if executor:
+                executor.shutdown(wait=False)
+
+@pytest.fixture
+def therapist(make_therapist):
+    """OmaniTherapistAI with the default test configuration"""
+    return make_therapist()
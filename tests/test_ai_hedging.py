@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test suite for hedged OpenAI/Claude requests
+"""
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import pytest
+from types import SimpleNamespace
+import omani_therapist_ai
+
+@pytest.fixture
+def ai(make_therapist):
+    return make_therapist(ai_hedge_delay=0.1)
+
+@pytest.fixture
+def release():
+    """Event that stalled provider calls block on; set at teardown so no worker is left waiting"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+class TestAIHedging:
+    """Test cases for _call_hedged"""
+
+    def test_fast_primary_wins_without_hedge(self, ai):
+        """Test that Claude is never called when OpenAI answers in time"""
+        claude_calls = []
+        ai._call_openai_gpt4 = lambda messages: "openai"
+        ai._call_claude_fallback = lambda messages: claude_calls.append(1) or "claude"
+
+        assert ai._call_hedged([]) == "openai"
+        assert claude_calls == []
+
+    def test_slow_primary_is_hedged(self, ai, release):
+        """Test that a stalled OpenAI call is overtaken by Claude"""
+        ai._call_openai_gpt4 = lambda messages: release.wait(10) and "openai"
+        ai._call_claude_fallback = lambda messages: "claude"
+
+        assert ai._call_hedged([]) == "claude"
+
+    def test_stalled_primaries_do_not_block_the_hedge(self, ai, release):
+        """Test that OpenAI calls still running from earlier turns cannot delay Claude"""
+        finished_primaries = []
+        ai._call_openai_gpt4 = lambda messages: release.wait(10) and finished_primaries.append(1)
+        ai._call_claude_fallback = lambda messages: "claude" if not finished_primaries else None
+
+        for _ in range(6):
+            assert ai._call_hedged([]) == "claude"
+
+    def test_both_failing_returns_none(self, ai):
+        """Test that None is returned when neither provider answers"""
+        ai._call_openai_gpt4 = lambda messages: None
+        ai._call_claude_fallback = lambda messages: None
+
+        assert ai._call_hedged([]) is None
+
+    def test_speculative_prefers_primary_within_grace(self, ai, monkeypatch):
+        """Test that with no delay OpenAI still wins if it answers after Claude but within the grace period"""
+        monkeypatch.setattr(omani_therapist_ai, "_PRIMARY_GRACE_PERIOD", 30.0)
+        claude_answered = threading.Event()
+        ai.ai_hedge_delay = 0
+        ai._call_openai_gpt4 = lambda messages: claude_answered.wait(10) and "openai"
+        ai._call_claude_fallback = lambda messages: claude_answered.set() or "claude"
+
+        assert ai._call_hedged([]) == "openai"
+
+    def test_speculative_uses_fallback_after_grace(self, ai, release, monkeypatch):
+        """Test that with no delay Claude answers when OpenAI misses the grace period"""
+        monkeypatch.setattr(omani_therapist_ai, "_PRIMARY_GRACE_PERIOD", 0.0)
+        ai.ai_hedge_delay = 0
+        ai._call_openai_gpt4 = lambda messages: release.wait(10) and "openai"
+        ai._call_claude_fallback = lambda messages: "claude"
+
+        assert ai._call_hedged([]) == "claude"
+
+class TestPrimaryClient:
+    """Test cases for _primary_openai_client"""
+
+    def test_sdk_retries_dropped_only_with_fallback(self, therapist):
+        """Test that retries are skipped for the chat call only when Claude can take over"""
+        therapist.openai_client = SimpleNamespace(with_options=lambda **options: options)
+
+        assert therapist.claude_client is None
+        assert therapist._primary_openai_client() is therapist.openai_client
+
+        therapist.claude_client = object()
+        assert therapist._primary_openai_client() == {"max_retries": 0}
+        assert therapist._primary_openai_client(hedged=True)["timeout"] < 30
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
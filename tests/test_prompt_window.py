@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test suite for the conversation window sent to the AI providers
+"""
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import pytest
+from datetime import datetime
+from omani_therapist_ai import ConversationMessage
+
+def _add_exchanges(ai, exchanges):
+    """Append user/assistant pairs after the system message"""
+    for i in range(exchanges):
+        ai.session_memory.append(ConversationMessage(role="user", content=f"user {i}", timestamp=datetime.now()))
+        ai.session_memory.append(ConversationMessage(role="assistant", content=f"ai {i}", timestamp=datetime.now()))
+    return ai
+
+class TestPromptWindow:
+    """Test cases for _prepare_messages_for_ai"""
+
+    def test_system_prompt_survives_long_sessions(self, therapist):
+        """Test that the system prompt is kept once history exceeds the window"""
+        ai = _add_exchanges(therapist, 20)
+
+        messages = ai._prepare_messages_for_ai()
+
+        assert messages[0] == {"role": "system", "content": ai.system_prompt}
+        assert messages[1]["role"] == "user"
+        assert len(messages) - 1 <= ai.max_memory_turns
+
+    def test_prefix_is_stable_between_consecutive_turns(self, therapist):
+        """Test that the window start does not move on every turn"""
+        ai = _add_exchanges(therapist, 6)
+        first = ai._prepare_messages_for_ai()
+
+        ai.session_memory.append(ConversationMessage(role="user", content="user 6", timestamp=datetime.now()))
+        ai.session_memory.append(ConversationMessage(role="assistant", content="ai 6", timestamp=datetime.now()))
+        second = ai._prepare_messages_for_ai()
+
+        assert second[:len(first)] == first
+
+    def test_short_history_is_sent_whole(self, therapist):
+        """Test that nothing is dropped while history fits in the window"""
+        ai = _add_exchanges(therapist, 3)
+
+        assert len(ai._prepare_messages_for_ai()) == 7
+
+    def test_summary_follows_system_prompt(self, therapist):
+        """Test that the summary of dropped messages is sent after the system prompt"""
+        ai = _add_exchanges(therapist, 20)
+        ai._history_summary = "The client feels anxious about work."
+        ai._summarized_messages = 32
+
+        messages = ai._prepare_messages_for_ai()
+
+        assert messages[0]["content"] == ai.system_prompt
+        assert messages[1]["role"] == "system"
+        assert "anxious about work" in messages[1]["content"]
+        assert messages[2]["role"] == "user"
+
+    def test_summary_prefix_follows_session_language(self, therapist):
+        """Test that the summary is introduced in the language of the active system prompt"""
+        ai = _add_exchanges(therapist, 20)
+        ai._history_summary = "The client feels anxious about work."
+
+        assert ai._prepare_messages_for_ai()[1]["content"].startswith(ai.summary_prefix_arabic)
+
+        ai._begin_turn("Hello, how are you today?")
+        assert ai._prepare_messages_for_ai()[1]["content"] == (
+            "Summary of the session so far: The client feels anxious about work."
+        )
+
+    def test_summary_is_scheduled_by_turns_only(self, therapist, monkeypatch):
+        """Test that building the payload never starts a summary and a new turn does"""
+        ai = _add_exchanges(therapist, 20)
+        scheduled = []
+        monkeypatch.setattr(ai, "_schedule_history_summary", lambda offset, upto: scheduled.append((offset, upto)))
+
+        ai._prepare_messages_for_ai()
+        assert scheduled == []
+
+        ai._begin_turn("Hello, how are you today?")
+        assert scheduled == [(1, 32)]  # 41 history messages, window of 10 moving in steps of 4
+
+    def test_claude_request_moves_summary_into_system(self, therapist):
+        """Test that Claude receives only user/assistant turns in messages"""
+        messages = [
+            {"role": "system", "content": "system prompt"},
+            {"role": "system", "content": "summary"},
+            {"role": "user", "content": "مرحبا"}
+        ]
+
+        system_blocks, user_messages = therapist._prepare_claude_request(messages)
+
+        assert [block["text"] for block in system_blocks] == ["system prompt", "summary"]
+        assert user_messages == [{"role": "user", "content": "مرحبا"}]
+
+class TestRefinementContext:
+    """Test cases for _get_recent_conversation_for_context"""
+
+    def test_context_is_truncated_and_reused(self, therapist):
+        """Test that each message is serialized once and long content is truncated"""
+        ai = _add_exchanges(therapist, 5)
+        ai.session_memory.append(ConversationMessage(role="user", content="x" * 300, timestamp=datetime.now()))
+
+        first = ai._get_recent_conversation_for_context()
+        second = ai._get_recent_conversation_for_context()
+
+        assert len(first) == 8
+        assert first[-1]["content"] == "x" * 200 + "..."
+        assert first[0]["timestamp"] == ai.session_memory[-8].timestamp.isoformat()
+        assert all(a is b for a, b in zip(first, second))
+
+    def test_context_follows_replaced_content(self, therapist):
+        """Test that a replaced system prompt is not served from the cached form"""
+        ai = therapist
+        assert ai._get_recent_conversation_for_context()[0]["content"] == ai.system_prompt_arabic[:200] + "..."
+
+        ai._begin_turn("Hello, how are you today?")
+        assert ai._get_recent_conversation_for_context()[0]["content"] == ai.system_prompt_english[:200] + "..."
+
+    def test_context_cache_stays_out_of_transcript(self, therapist, tmp_path):
+        """Test that the cached context form is not written to the JSONL log"""
+        ai = _add_exchanges(therapist, 1)
+        ai.session_memory[1].context_dict()
+        with open(tmp_path / "log.jsonl", "w", encoding="utf-8") as log:
+            ai._transcript_log = log
+            ai._log_message(ai.session_memory[1])
+
+        record = json.loads((tmp_path / "log.jsonl").read_text(encoding="utf-8"))
+        assert set(record) == {"role", "content", "timestamp", "voice_gender", "emotion"}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
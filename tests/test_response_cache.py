@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test suite for the persistent AI response cache
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import pytest
+from response_cache import AudioCache, ResponseCache
+
+class TestResponseCache:
+    """Test cases for the SQLite response cache"""
+
+    def test_round_trip_survives_reopen(self, tmp_path):
+        """Test that stored responses persist across cache instances"""
+        db_path = str(tmp_path / "cache.sqlite")
+        messages = [
+            {"role": "system", "content": "أنت دكتور نفسي عماني"},
+            {"role": "user", "content": "مرحبا"}
+        ]
+        key = ResponseCache.make_key(messages)
+
+        cache = ResponseCache(db_path)
+        assert cache.get(key) is None
+        cache.put(key, "أهلاً وسهلاً")
+        cache.close()
+
+        reopened = ResponseCache(db_path)
+        assert reopened.get(key) == "أهلاً وسهلاً"
+        reopened.close()
+
+    def test_key_depends_on_conversation_history(self):
+        """Test that the same input in a different context is a different key"""
+        first_turn = [
+            {"role": "system", "content": "prompt"},
+            {"role": "user", "content": "نعم"}
+        ]
+        later_turn = [
+            {"role": "system", "content": "prompt"},
+            {"role": "user", "content": "أحس بقلق"},
+            {"role": "assistant", "content": "هل تريد أن نتكلم عنه؟"},
+            {"role": "user", "content": "نعم"}
+        ]
+
+        assert ResponseCache.make_key(first_turn) != ResponseCache.make_key(later_turn)
+
+    def test_key_ignores_diacritics_and_spacing(self):
+        """Test that STT variants of the same utterance share a key"""
+        plain = [{"role": "system", "content": "prompt"}, {"role": "user", "content": "كيف حالك Doctor"}]
+        variant = [{"role": "system", "content": "prompt"}, {"role": "user", "content": " كَيْفَ  حالـك doctor "}]
+
+        assert ResponseCache.make_key(plain) == ResponseCache.make_key(variant)
+
+    def test_alef_spellings_normalize_alike(self):
+        """Test that hamza and madda alef forms normalize to bare alef"""
+        assert ResponseCache.normalize_text("أنا إلى آخر") == ResponseCache.normalize_text("انا الى اخر")
+
+    def test_memory_layer_is_bounded(self, tmp_path):
+        """Test that the in-memory LRU evicts but SQLite still serves old keys"""
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"), memory_size=2)
+        for i in range(3):
+            cache.put(f"k{i}", f"v{i}")
+
+        assert list(cache._memory) == ["k1", "k2"]
+        assert cache.get("k0") == "v0"
+        cache.close()
+
+class TestAudioCache:
+    """Test cases for the TTS audio cache"""
+
+    def test_key_depends_on_format(self):
+        """Test that WAV and MP3 renditions of the same SSML are kept apart"""
+        assert AudioCache.make_key("<speak/>", "wav") != AudioCache.make_key("<speak/>", "mp3")
+
+    def test_disk_copy_survives_new_instance(self, tmp_path):
+        """Test that audio written to the cache directory is found by a new cache"""
+        key = AudioCache.make_key("<speak>مرحبا</speak>", "mp3")
+        AudioCache(str(tmp_path)).put(key, b"ID3audio")
+
+        assert AudioCache(str(tmp_path)).get(key) == b"ID3audio"
+        assert AudioCache().get(key) is None
+
+    def test_memory_is_bounded_by_bytes(self):
+        """Test that memory holds a byte budget and skips clips too large to be worth it"""
+        cache = AudioCache(max_memory_bytes=400)
+        cache.put("big", b"x" * 101)
+        for i in range(5):
+            cache.put(f"k{i}", b"x" * 100)
+
+        assert cache.get("big") is None
+        assert list(cache._memory) == ["k1", "k2", "k3", "k4"]
+
+    def test_disk_evicts_least_recently_used(self, tmp_path):
+        """Test that the directory is trimmed once it outgrows its budget"""
+        cache = AudioCache(str(tmp_path), max_memory_bytes=0, max_disk_bytes=300)
+        for i in range(3):
+            cache.put(f"k{i}", b"x" * 100)
+            os.utime(tmp_path / f"k{i}.audio", (i, i))
+        cache.put("k3", b"x" * 100)
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["k2.audio", "k3.audio"]
+        assert cache.get("k0") is None
+        assert cache.get("k3") == b"x" * 100
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
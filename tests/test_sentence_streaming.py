@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test suite for sentence chunking of streamed AI responses
+"""
+import sys
+import os
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import pytest
+from omani_therapist_ai import TimingMetrics, iter_sentences
+
+class TestSentenceStreaming:
+    """Test cases for regrouping streamed deltas into sentences"""
+
+    def test_arabic_question_mark_ends_sentence(self):
+        """Test that the Arabic question mark flushes a sentence"""
+        deltas = ["مرحبا، كيف", " حالك؟ أنا", " هنا لمساعدتك"]
+
+        sentences = list(iter_sentences(iter(deltas)))
+
+        assert sentences == ["مرحبا، كيف حالك؟", "أنا هنا لمساعدتك"]
+
+    def test_decimals_are_not_split(self):
+        """Test that a period inside a number does not end a sentence"""
+        deltas = ["Breathe slowly", " for 2.5 minutes. Then", " relax"]
+
+        sentences = list(iter_sentences(iter(deltas)))
+
+        assert sentences == ["Breathe slowly for 2.5 minutes.", "Then relax"]
+
+    def test_line_breaks_end_sentence(self):
+        """Test that line breaks flush the buffered text"""
+        sentences = list(iter_sentences(iter(["أولاً\nثانياً"])))
+
+        assert sentences == ["أولاً", "ثانياً"]
+
+    def test_long_clause_is_flushed_early(self):
+        """Test that a long sentence is split at its last Arabic comma"""
+        clause = "أفهم أنك تمر بفترة صعبة جداً في العمل ومع العائلة في نفس الوقت، "
+        deltas = [clause * 2, "وهذا طبيعي"]
+
+        sentences = list(iter_sentences(iter(deltas)))
+
+        assert sentences == [(clause * 2).strip(), "وهذا طبيعي"]
+
+    def test_short_clause_is_not_split(self):
+        """Test that commas in a short sentence do not flush it"""
+        sentences = list(iter_sentences(iter(["نعم، أفهمك، ", "تماماً."])))
+
+        assert sentences == ["نعم، أفهمك، تماماً."]
+
+    def test_empty_stream(self):
+        """Test that an empty stream yields nothing"""
+        assert list(iter_sentences(iter([]))) == []
+
+class TestSentencePipeline:
+    """Test cases for the threaded synthesize-while-playing pipeline"""
+
+    @staticmethod
+    def _fake_audio(ai, played):
+        """Replace synthesis, decoding and playback with in-memory fakes"""
+        ai.speak_text = lambda text, *args, **kwargs: text.encode('utf-8')
+        ai._decode_audio = lambda audio: audio.decode('utf-8')
+        ai._play_sound = lambda sound, timing_metrics=None: played.append(sound)
+        return ai
+
+    def test_sentences_play_in_order(self, therapist):
+        """Test that every sentence is synthesized and played in speaking order"""
+        played = []
+        ai = self._fake_audio(therapist, played)
+
+        count, success = ai.speak_sentences(iter(["واحد.", "اثنان.", "ثلاثة."]), TimingMetrics.for_speech())
+
+        assert (count, success) == (3, True)
+        assert played == ["واحد.", "اثنان.", "ثلاثة."]
+
+    def test_order_kept_when_later_sentences_finish_first(self, therapist):
+        """Test that concurrent synthesis still plays sentences in order"""
+        played = []
+        ai = self._fake_audio(therapist, played)
+        # Each sentence's synthesis only finishes after the one spoken after it
+        finished = {text: threading.Event() for text in ("first", "second", "third")}
+        waits_for = {"first": "second", "second": "third"}
+
+        def reversed_speak_text(text, *args, **kwargs):
+            if text in waits_for:
+                assert finished[waits_for[text]].wait(10)
+            finished[text].set()
+            return text.encode('utf-8')
+        ai.speak_text = reversed_speak_text
+
+        ai.speak_sentences(iter(["first", "second", "third"]), TimingMetrics.for_speech())
+
+        assert played == ["first", "second", "third"]
+
+    def test_full_text_is_spoken_per_sentence(self, therapist):
+        """Test that speak_text_streaming splits text and uses the given emotion"""
+        played = []
+        emotions = []
+        ai = self._fake_audio(therapist, played)
+
+        def record_speak_text(text, voice_gender, emotion, *args, **kwargs):
+            emotions.append(emotion)
+            return text.encode('utf-8')
+        ai.speak_text = record_speak_text
+
+        assert ai.speak_text_streaming("أهلاً بك. كيف حالك اليوم؟", "encouraging")
+        assert played == ["أهلاً بك.", "كيف حالك اليوم؟"]
+        assert emotions == ["encouraging", "encouraging"]
+
+    def test_failed_synthesis_is_skipped(self, therapist):
+        """Test that a sentence whose synthesis fails is not played"""
+        played = []
+        ai = self._fake_audio(therapist, played)
+        ai.speak_text = lambda text, *args, **kwargs: b'' if text == "bad" else text.encode('utf-8')
+
+        count, success = ai.speak_sentences(iter(["bad", "good"]), TimingMetrics.for_speech())
+
+        assert (count, success) == (2, True)
+        assert played == ["good"]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test suite for SSML document generation
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import pytest
+import xml.etree.ElementTree as ET
+from dataclasses import replace
+from datetime import datetime
+from omani_therapist_ai import ConversationMessage
+
+@pytest.fixture
+def ai(therapist):
+    therapist._assess_crisis_level = lambda: 'none'
+    return therapist
+
+class TestSSMLGeneration:
+    """Test cases for _create_ssml_text"""
+
+    def test_special_characters_produce_valid_xml(self, ai):
+        """Test that '&' and '<' in response text are escaped"""
+        ssml = ai._create_ssml_text("Work & family <3 *soft sigh* كيف حالك", "calm")
+
+        root = ET.fromstring(ssml)
+        assert "Work & family <3" in "".join(root.itertext())
+        assert '<break time="500ms"/>' in ssml
+
+    def test_wrapper_is_reused_per_voice_and_prosody(self, ai):
+        """Test that one template serves every text with the same settings"""
+        ai._create_ssml_text("أولاً", "calm")
+        ai._create_ssml_text("ثانياً", "calm")
+        ai._create_ssml_text("ثالثاً", "sad")
+
+        assert len(ai._ssml_templates) == 2
+
+    def test_language_selects_xml_lang_and_voice(self, ai):
+        """Test that English text gets the English voice and xml:lang"""
+        ssml = ai._create_ssml_text("Hello", "neutral", language="en")
+
+        assert 'xml:lang="en-US"' in ssml
+        assert f'name="{ai.voices["en"][ai.default_voice_gender]}"' in ssml
+
+    def test_emotion_markers_become_breaks(self, ai):
+        """Test that refinement markers are replaced case-insensitively in one pass"""
+        text = ai._add_natural_pauses("أهلاً *Soft Sigh* كيف حالك *tired sigh* *بلطف* اليوم", "neutral")
+
+        assert text == 'أهلاً <break time="500ms"/> كيف حالك <break time="550ms"/> اليوم'
+
+    def test_case_variant_markers_do_not_raise(self, ai):
+        """Test that markers matched through Unicode case folding still map to their break"""
+        text = ai._add_natural_pauses("أهلاً *ſoft ſigh* كيف حالك *SOFT SIGH* اليوم", "neutral")
+
+        assert text == 'أهلاً <break time="500ms"/> كيف حالك <break time="500ms"/> اليوم'
+
+    def test_model_markup_is_stripped_and_breaks_normalized(self, ai):
+        """Test that SSML emitted by the model cannot break out of our wrapper"""
+        text = ai._clean_ssml_content(
+            "<speak><voice name='x'><emphasis>مرحبا</emphasis> <bbreak time=\"300ms\"> "
+            "<break time='200ms'> أهلاً</voice></speak>"
+        )
+
+        assert text == 'مرحبا <break time="300ms"/> <break time="200ms"/> أهلاً'
+
+class TestCrisisLevel:
+    """Test cases for _assess_crisis_level, which adjusts the TTS prosody"""
+
+    @staticmethod
+    def _level(make_therapist, *user_messages):
+        ai = make_therapist()
+        ai.session_memory.extend(ConversationMessage(role="user", content=text, timestamp=datetime.now())
+                                 for text in user_messages)
+        return ai._assess_crisis_level()
+
+    def test_most_severe_level_wins(self, make_therapist):
+        """Test that a severe indicator outranks milder ones in the same window"""
+        assert self._level(make_therapist, "I feel sad", "Sometimes I want to END IT ALL") == 'severe'
+        assert self._level(make_therapist, "أنا حزين ويائس") == 'moderate'
+        assert self._level(make_therapist, "أنا قلق شوي") == 'mild'
+        assert self._level(make_therapist, "كيف حالك") == 'none'
+
+    def test_assessment_follows_new_messages(self, therapist):
+        """Test that the cached level is recomputed once a message is added"""
+        ai = therapist
+        ai.session_memory.append(ConversationMessage(role="user", content="كيف حالك", timestamp=datetime.now()))
+        assert ai._assess_crisis_level() == 'none'
+
+        ai.session_memory.append(ConversationMessage(role="user", content="I feel hopeless", timestamp=datetime.now()))
+        assert ai._assess_crisis_level() == 'moderate'
+        assert ai._assess_crisis_level() == 'moderate'
+
+    def test_assessment_follows_replaced_messages(self, therapist):
+        """Test that replacing a message in place (same length and position) invalidates the cache"""
+        ai = therapist
+        ai.session_memory.append(ConversationMessage(role="user", content="كيف حالك", timestamp=datetime.now()))
+        assert ai._assess_crisis_level() == 'none'
+
+        ai.session_memory[-1] = replace(ai.session_memory[-1], content="I feel hopeless")
+        assert ai._assess_crisis_level() == 'moderate'
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test suite for session timing statistics
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+import pytest
+import omani_therapist_ai
+from omani_therapist_ai import TimingMetrics
+
+def _turn(total, stt=1.0, ai=2.0, tts=0.5):
+    return TimingMetrics(
+        speech_start_time=0.0,
+        speech_end_time=stt,
+        ai_processing_start_time=stt,
+        ai_processing_end_time=stt + ai,
+        tts_start_time=stt + ai,
+        tts_end_time=stt + ai + tts,
+        voice_playback_start_time=total
+    )
+
+class TestTimingStatistics:
+    """Test cases for record_timing and get_timing_statistics"""
+
+    def test_running_aggregates(self, therapist):
+        """Test averages, best and worst latency over recorded turns"""
+        ai = therapist
+
+        assert ai.get_timing_statistics() == {}
+
+        for total in (4.0, 2.0, 6.0):
+            ai.record_timing(_turn(total))
+
+        stats = ai.get_timing_statistics()
+        assert stats['total_conversations'] == 3
+        assert stats['avg_total_latency'] == pytest.approx(4.0)
+        assert stats['min_total_latency'] == 2.0
+        assert stats['max_total_latency'] == 6.0
+        assert stats['avg_ai_duration'] == pytest.approx(2.0)
+
+    def test_statistics_cover_turns_beyond_history(self, make_therapist, monkeypatch):
+        """Test that the capped per-turn history does not truncate the statistics"""
+        monkeypatch.setattr(omani_therapist_ai, "TIMING_HISTORY_SIZE", 2)
+        ai = make_therapist()
+
+        for total in (1.0, 2.0, 3.0, 10.0):
+            ai.record_timing(_turn(total))
+
+        stats = ai.get_timing_statistics()
+        assert len(ai.timing_history) == 2
+        assert stats['total_conversations'] == 4
+        assert stats['avg_total_latency'] == pytest.approx(4.0)
+        assert stats['min_total_latency'] == 1.0
+
+class TestTimingMetrics:
+    """Test cases for TimingMetrics serialization"""
+
+    def test_epoch_dict_keeps_wall_clock_contract(self):
+        """Test that API timestamps are epoch seconds with durations preserved"""
+        now = time.perf_counter()
+        metrics = TimingMetrics.for_speech(now, now + 1.5)
+
+        timing = metrics.as_epoch_dict()
+
+        assert timing['speech_start_time'] == pytest.approx(time.time(), abs=1.0)
+        assert timing['speech_end_time'] - timing['speech_start_time'] == pytest.approx(1.5)
+        assert timing['tts_end_time'] == 0.0
+        assert set(timing) == set(metrics.__dict__)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])